@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 """ Matrix style rain with secret 'redpill' login - Based on SPtrader version """
 import argparse
+import collections
 import curses
 import datetime
 import importlib.metadata
 import itertools
 import os
 import random
+import subprocess
 import time
 import math
 import sys
 
+from typing import Iterator
 from typing import List
+from typing import NamedTuple
 from typing import Optional
 from typing import Sequence
 from typing import Tuple
@@ -46,6 +50,11 @@ KATAKANA_CHAR_LIST_ADDON = ["0", "1", "2", "3", "4", "5", "7", "8", "9", "Z",
                             ":", ".", "=", "*", "+", "-", "<", ">", "|", "¦",
                             "╌", "—", "▪", '"']
 
+# Character sets are built once; build_character_set2 only picks one
+CHAR_TUPLE = tuple(CHAR_LIST)
+EXT_CHAR_TUPLE = tuple(EXT_CHAR_LIST)
+KATAKANA_FULL_TUPLE = tuple(KATAKANA_CHAR_LIST + KATAKANA_CHAR_LIST_ADDON)
+
 # Access granted reveal effect constants
 ACCESS_TEXT = "ACCESS GRANTED"
 ACCESS_DELAY = 3  # frames between each letter reveal (2x faster than SPtrader)
@@ -73,12 +82,46 @@ CURSES_CH_CODES_COLOR = {114: "red", 82: "red", 116: "green", 84: "green",
                          20: "green", 25: "blue", 21: "yellow", 9: "magenta",
                          15: "cyan", 16: "white", 27: "black", 91: "black",
                          123: "black"}
+# Both color tables share the same key order
+COLOR_NAMES = tuple(CURSES_COLOR)
+# Terminal escape for each color, used by --list_colors
+ANSI_COLOR = {"red": "\033[91m", "green": "\033[92m", "blue": "\033[94m",
+              "cyan": "\033[96m", "yellow": "\033[93m", "magenta": "\033[95m",
+              "white": "\033[97m", "black": "\033[90m"}
 DEFAULT_BG_CHAR = " "
 DEFAULT_CYCLE_COLOR_DELAY = 500
 WAKE_UP_PAIR = 21
 WAKE_UP_KEYS = [119, 65, 107, 101]
+# Per-letter delays below this are drawn in one go (seconds)
+TYPE_EFFECT_MIN_DELAY = 0.02
+TYPED_TEXT_MAX = 20
+START_BACKGROUND_SCRIPT = "/home/millet_frazier/SPtrader/start_background.sh"
+START_BACKGROUND_LOG = "/home/millet_frazier/SPtrader/logs/runtime/start_background.log"
+# Longest wait for the background services script before launching anyway
+START_BACKGROUND_TIMEOUT = 120
 MIN_SCREEN_SIZE_Y = 10
 MIN_SCREEN_SIZE_X = 10
+RESIZE_POLL_FRAMES = 30
+# One in three characters is bold when bold is on (-b)
+BOLD_ON_CHOICES = (1, 0, 0)
+LEAD_PAIR = 10
+RANDOM_COLOR_PAIRS = range(1, 8)
+CORNER_PAIR = 11
+
+# Corner text: each glyph glitches for CORNER_GLITCH_FRAMES (0.2 seconds)
+CORNER_GLITCH_FRAMES = 12
+SP_GLITCH_CHARS = (("Z", "7", "ﾓ", "ｷ", "ﾂ", "ﾊ"),
+                   ("9", "ﾖ", "ｻ", "ﾘ", "ｱ", "ﾒ"))
+TRADER_GLITCH_CHARS = ("ﾈ", "ﾋ", "ｿ", "ﾜ", "ｴ", "ﾑ", "ﾗ", "ｵ", "ﾅ")
+
+
+class CornerGlyph(NamedTuple):
+    start: int  # frame the glyph first appears
+    y: int
+    x: int
+    char: str
+    glitch_chars: Tuple[str, ...]
+    random_glitch: bool  # random glitch chars instead of cycling
 
 
 class PyMatrixError(Exception):
@@ -86,11 +129,27 @@ class PyMatrixError(Exception):
 
 
 class SingleLine:
+    # Fixed attribute layout: lines are created and stepped every frame, so
+    # slot access keeps the per-line state compact and lookups cheap.
+    __slots__ = ("direction", "height", "width",
+                 "async_scroll_rate", "line_color_number", "lead_y", "y",
+                 "x", "last_y", "lead_x", "last_x")
+    # Each direction has a subclass below holding its per-frame methods, and
+    # SingleLine(..., direction) builds the one for that direction. Calls skip
+    # re-testing the direction without each line holding bound methods of
+    # itself, which would make every line a reference cycle
+    direction_classes: Dict[str, type] = {}
+
+    def __new__(cls, y: int, x: int, width: int, height: int, direction: str):
+        if cls is SingleLine:
+            cls = SingleLine.direction_classes[direction]
+        return super().__new__(cls)
+
     def __init__(self, y: int, x: int, width: int, height: int, direction: str):
         self.direction = direction
         self.height = height - 2
         self.width = width - 1
-        self.async_scroll_count = 0
+        # With -a the line moves every async_scroll_rate + 1 frames
         self.async_scroll_rate = random.randint(0, 4)
         self.line_color_number = random.randint(1, 7)  # keep for now
         if direction == "down":
@@ -122,124 +181,131 @@ class SingleLine:
             self.lead_y = 0
             self.last_y = 0
 
+
+class DownLine(SingleLine):
+    __slots__ = ()
+
     def get_lead(self) -> Union[Tuple[int, int], None]:
-        if self.direction == "down":
-            if self.lead_y > self.height:
-                return None
-            else:
-                lead_y = self.lead_y
-                self.lead_y += 1
-                return lead_y, self.x
-        elif self.direction == "up":
-            if self.lead_y < 0:
-                return None
-            else:
-                lead_y = self.lead_y
-                self.lead_y -= 1
-                return lead_y, self.x
-        elif self.direction == "right":
-            if self.lead_x >= self.width:
-                return None
-            else:
-                lead_x = self.lead_x
-                self.lead_x += 1
-                return self.y, lead_x
-        elif self.direction == "left":
-            if self.lead_x < 0:
-                return None
-            else:
-                lead_x = self.lead_x
-                self.lead_x -= 1
-                return self.y, lead_x
+        if self.lead_y > self.height:
+            return None
+        lead_y = self.lead_y
+        self.lead_y += 1
+        return lead_y, self.x
 
     def get_next(self) -> Union[Tuple[int, int], None]:
-        if self.direction == "down":
-            if self.y < 0 or self.y > self.height:
-                self.y += 1
-                return None
-            else:
-                y = self.y
-                self.y += 1
-                return y, self.x
-        elif self.direction == "up":
-            if self.y > self.height or self.y < 0:
-                self.y -= 1
-                return None
-            else:
-                y = self.y
-                self.y -= 1
-                return y, self.x
-        elif self.direction == "right":
-            if self.x < 0 or self.x >= self.width:
-                self.x += 1
-                return None
-            else:
-                x = self.x
-                self.x += 1
-                return self.y, x
-        elif self.direction == "left":
-            if self.x >= self.width or self.x < 0:
-                self.x -= 1
-                return None
-            else:
-                x = self.x
-                self.x -= 1
-                return self.y, x
+        y = self.y
+        self.y += 1
+        if y < 0 or y > self.height:
+            return None
+        return y, self.x
 
     def delete_last(self) -> Union[Tuple[int, int], None]:
-        if self.direction == "down":
-            if self.last_y < 0 or self.last_y > self.height:
-                self.last_y += 1
-                return None
-            else:
-                last_y = self.last_y
-                self.last_y += 1
-                return last_y, self.x
-        elif self.direction == "up":
-            if self.last_y > self.height or self.last_y < 0:
-                self.last_y -= 1
-                return None
-            else:
-                last_y = self.last_y
-                self.last_y -= 1
-                return last_y, self.x
-        elif self.direction == "right":
-            if self.last_x < 0 or self.last_x >= self.width:
-                self.last_x += 1
-                return None
-            else:
-                last_x = self.last_x
-                self.last_x += 1
-                return self.y, last_x
-        elif self.direction == "left":
-            if self.last_x >= self.width:
-                self.last_x -= 1
-                return None
-            else:
-                last_x = self.last_x
-                self.last_x -= 1
-                return self.y, last_x
+        last_y = self.last_y
+        self.last_y += 1
+        if last_y < 0 or last_y > self.height:
+            return None
+        return last_y, self.x
 
     def okay_to_delete(self) -> bool:
-        if self.direction == "down":
-            return True if self.last_y > self.height else False
-        elif self.direction == "up":
-            return True if self.last_y < 0 else False
-        elif self.direction == "right":
-            return True if self.last_x >= self.width else False
-        elif self.direction == "left":
-            return True if self.last_x < 0 else False
-
-    def async_scroll_turn(self) -> bool:
-        if self.async_scroll_count == self.async_scroll_rate:
-            self.async_scroll_count = 0
-            return True
-        else:
-            self.async_scroll_count += 1
-            return False
+        return self.last_y > self.height
+
+
+class UpLine(SingleLine):
+    __slots__ = ()
+
+    def get_lead(self) -> Union[Tuple[int, int], None]:
+        if self.lead_y < 0:
+            return None
+        lead_y = self.lead_y
+        self.lead_y -= 1
+        return lead_y, self.x
+
+    def get_next(self) -> Union[Tuple[int, int], None]:
+        y = self.y
+        self.y -= 1
+        if y > self.height or y < 0:
+            return None
+        return y, self.x
+
+    def delete_last(self) -> Union[Tuple[int, int], None]:
+        last_y = self.last_y
+        self.last_y -= 1
+        if last_y > self.height or last_y < 0:
+            return None
+        return last_y, self.x
+
+    def okay_to_delete(self) -> bool:
+        return self.last_y < 0
+
+
+class RightLine(SingleLine):
+    __slots__ = ()
+
+    def get_lead(self) -> Union[Tuple[int, int], None]:
+        if self.lead_x >= self.width:
+            return None
+        lead_x = self.lead_x
+        self.lead_x += 1
+        return self.y, lead_x
+
+    def get_next(self) -> Union[Tuple[int, int], None]:
+        x = self.x
+        self.x += 1
+        if x < 0 or x >= self.width:
+            return None
+        return self.y, x
+
+    def delete_last(self) -> Union[Tuple[int, int], None]:
+        last_x = self.last_x
+        self.last_x += 1
+        if last_x < 0 or last_x >= self.width:
+            return None
+        return self.y, last_x
+
+    def okay_to_delete(self) -> bool:
+        return self.last_x >= self.width
+
+
+class LeftLine(SingleLine):
+    __slots__ = ()
+
+    def get_lead(self) -> Union[Tuple[int, int], None]:
+        if self.lead_x < 0:
+            return None
+        lead_x = self.lead_x
+        self.lead_x -= 1
+        return self.y, lead_x
+
+    def get_next(self) -> Union[Tuple[int, int], None]:
+        x = self.x
+        self.x -= 1
+        if x >= self.width or x < 0:
+            return None
+        return self.y, x
+
+    def delete_last(self) -> Union[Tuple[int, int], None]:
+        last_x = self.last_x
+        self.last_x -= 1
+        if last_x >= self.width:
+            return None
+        return self.y, last_x
+
+    def okay_to_delete(self) -> bool:
+        return self.last_x < 0
+
+
+SingleLine.direction_classes.update(down=DownLine, up=UpLine,
+                                     right=RightLine, left=LeftLine)
 
 
 class OldScrollingLine:
+    # Cells always form a contiguous run that moves down one row per frame,
+    # so only the glyphs are stored (oldest first) along with the row of
+    # the newest cell. Advancing the whole run is then a single increment
+    # instead of touching every cell.
+    __slots__ = ("height", "width", "y", "x", "length", "lead_y",
+                 "lead_char", "cell_chars", "tail_y", "line_color_number",
+                 "bold")
     old_scroll_chr_list = []
 
     def __init__(self, x: int, width: int, height: int):
@@ -250,7 +316,8 @@ class OldScrollingLine:
         self.length = random.randint(3, height - 3)
         self.lead_y = 0
         self.lead_char = random.choice(OldScrollingLine.old_scroll_chr_list)
-        self.location_list = []
+        self.cell_chars: collections.deque = collections.deque()
+        self.tail_y = 0  # row of the newest cell (cell_chars[-1])
         self.line_color_number = random.randint(1, 7)
         self.bold = True if random.randint(1, 3) <= 1 else False
 
@@ -258,9 +325,9 @@ class OldScrollingLine:
     def update_char_list(cls, updated_char_list: List[str]) -> None:
         OldScrollingLine.old_scroll_chr_list = updated_char_list
 
-    def delete_last(self) -> Union[None, List[int]]:
-        if len(self.location_list) == self.length or self.y >= self.length:
-            return self.location_list[-1][0:2]
+    def delete_last(self) -> Union[None, Tuple[int, int]]:
+        if len(self.cell_chars) == self.length or self.y >= self.length:
+            return self.tail_y, self.x
         else:
             return None
 
@@ -272,21 +339,23 @@ class OldScrollingLine:
         else:
             return None
 
-    def get_next(self) -> List[List]:
-        if len(self.location_list) != 0 and self.y >= 0:
-            for cell in self.location_list:
-                cell[0] += 1
-        if len(self.location_list) < self.length and 0 <= self.y < self.height:
-            self.location_list.append(
-                [0, self.x, random.choice(OldScrollingLine.old_scroll_chr_list)]
-            )
+    def get_next(self) -> Iterator[Tuple[int, int, str]]:
+        """Advance one frame; returns (y, x, char) cells, oldest first"""
+        if self.cell_chars and self.y >= 0:
+            self.tail_y += 1
+        if len(self.cell_chars) < self.length and 0 <= self.y < self.height:
+            self.cell_chars.append(
+                random.choice(OldScrollingLine.old_scroll_chr_list))
+            self.tail_y = 0
         if self.y > self.height:
-            self.location_list.pop(0)
+            self.cell_chars.popleft()
         self.y += 1
-        return self.location_list
+        count = len(self.cell_chars)
+        return zip(range(self.tail_y + count - 1, self.tail_y - 1, -1),
+                   itertools.repeat(self.x, count), self.cell_chars)
 
     def okay_to_delete(self) -> bool:
-        return len(self.location_list) == 0 and self.y > self.height
+        return len(self.cell_chars) == 0 and self.y > self.height
 
 
 class Matrix:
@@ -303,6 +372,7 @@ class Matrix:
         self.wake_up_time = 20 if self.args.test_mode \
             else random.randint(2000, 3000)
         self.char_set = build_character_set2(args)
+        self._char_tuple = tuple(self.char_set)
         if args.reverse:
             self.dir = "up"
         elif args.scroll_right:
@@ -315,21 +385,39 @@ class Matrix:
             self.dir = "down"
         if self.args.multiple_mode:
             self.color_mode = "multiple"
-            setup_curses_colors("random",
-                                self.args.background, self.args.over_ride)
+            setup_curses_random_colors(self.args.palette_ints,
+                                       self.args.bg_int)
         elif self.args.random_mode:
             self.color_mode = "random"
-            setup_curses_colors("random",
-                                self.args.background, self.args.over_ride)
+            setup_curses_random_colors(self.args.palette_ints,
+                                       self.args.bg_int)
         elif self.args.cycle:
             self.color_mode = "cycle"
         else:
             self.color_mode = "normal"
         self.spacer = 2 if self.args.double_space else 1
+        # Frame deadline on the monotonic clock so render time is not
+        # added on top of the delay.
+        self._frame_period = DELAY_SPEED[self.args.delay]
+        self._next_frame = time.monotonic()
         self.line_list = []
-        self.x_list = []
-        self.y_list = []
+        # Async scrolling (-a): lines filed by (period, phase) so each frame
+        # only visits the lines whose turn it is.
+        self._async_buckets: Dict[Tuple[int, int], List[SingleLine]] = {}
+        self._frame_no = 0
+        # Free columns, with each column's index for O(1) swap-pop removal
+        self.x_list: List[int] = []
+        self.x_pos: Dict[int, int] = {}
+        self.y_list: Sequence[int] = range(0)
         self.keys_pressed = []
+        # Keys read while waiting for the next frame, handled in order
+        self._input_q: collections.deque = collections.deque()
+        self._resized = False
+        self._resize_poll_count = 0
+        # Pending cell writes for the current frame: {y: {x: (char, attr)}}
+        self._write_buf: Dict[int, Dict[int, Tuple[str, int]]] = {}
+        # Trailing-edge cells to blank this frame: {y: {x, ...}}
+        self._clear_buf: Dict[int, Set[int]] = {}
         
         # Access granted reveal effect attributes
         self.access_granted = False
@@ -337,18 +425,25 @@ class Matrix:
         self.access_timer = 0
         self.access_positions: List[Tuple[int, int, str]] = []
         self.access_effects: Dict[Tuple[int, int], Dict] = {}
+        # Revealed cells/columns, kept in step with access_progress
         self.revealed_positions: Set[Tuple[int, int]] = set()
+        self._access_cols_so_far: Set[int] = set()
+        # Row -> revealed columns; flush_writes masks these out per row
+        self._access_mask: Dict[int, Set[int]] = {}
         
         # Corner text effects
         self.corner_timer = 0
+        self._corner_schedule: List[CornerGlyph] = []
         self.sp_shown = False
         self.sp_display_time = 0
         self.trader_shown = False
         self.trader_progress = 0
         
         # Secret login state
-        self.typed_text = ""
         self.secret_password = "redpill"
+        # Last 20 typed characters (lower-cased), joined only on Enter
+        self.typed_text: collections.deque = collections.deque(
+            maxlen=TYPED_TEXT_MAX)
         
         self.main_loop()
 
@@ -369,12 +464,16 @@ class Matrix:
 
     def is_access_position(self, x: int, y: int) -> bool:
         """Check if position is reserved for access text"""
-        if not self.access_granted:
-            return False
-        for rx, ry, _ in self.access_positions[:self.access_progress]:
-            if x == rx and y == ry:
-                return True
-        return False
+        return x in self._access_mask.get(y, ())
+
+    def sync_revealed_positions(self) -> None:
+        """Rebuild the revealed cell/column sets from access_progress"""
+        revealed = self.access_positions[:self.access_progress]
+        self.revealed_positions = {(x, y) for x, y, _ in revealed}
+        self._access_cols_so_far = {x for x, _, _ in revealed}
+        self._access_mask = {}
+        for x, y, _ in revealed:
+            self._access_mask.setdefault(y, set()).add(x)
 
     def draw_access_text(self) -> None:
         """Draw the ACCESS GRANTED reveal effect"""
@@ -392,12 +491,11 @@ class Matrix:
                     else:
                         char = rchar
                     # Green color during transition with bold
-                    self.screen.addstr(ry, rx, char, 
-                                     curses.color_pair(2) | curses.A_BOLD)
+                    self.screen.addstr(ry, rx, char, self._attr_lut[2][1][0])
                 else:
                     # Fully revealed - show actual character in bright green
-                    self.screen.addstr(ry, rx, rchar, 
-                                     curses.color_pair(10) | curses.A_BOLD)
+                    self.screen.addstr(ry, rx, rchar,
+                                       self._attr_lut[LEAD_PAIR][1][0])
             except curses.error:
                 # Ignore if position is out of bounds
                 pass
@@ -405,25 +503,36 @@ class Matrix:
     def main_loop(self) -> None:
         size_y, size_x = self.screen.getmaxyx()
         self.check_screen_size(size_y, size_x)
-        self.x_list = [x for x in range(0, size_x, self.spacer)]
-        self.y_list = [y for y in range(1, size_y)]
+        self.reset_free_cells(size_y, size_x)
         
         # Calculate access positions
         self.access_positions = self.calculate_access_positions(size_x, size_y)
+        self.build_corner_schedule(size_y, size_x)
 
         time_delta = datetime.timedelta(seconds=self.args.run_timer)
         end_time = datetime.datetime.now() + time_delta
         while True:
-            if curses.is_term_resized(size_y, size_x):
+            # Resizes normally arrive as KEY_RESIZE through input handling;
+            # polling the terminal size every few frames is the fallback for
+            # a KEY_RESIZE swallowed by one of the input buffer drains.
+            self._resize_poll_count += 1
+            if self._resize_poll_count >= RESIZE_POLL_FRAMES:
+                self._resize_poll_count = 0
+                if curses.is_term_resized(size_y, size_x):
+                    self._resized = True
+            if self._resized:
+                self._resized = False
                 size_y, size_x = self.screen.getmaxyx()
                 self.check_screen_size(size_y, size_x)
-                self.x_list = [x for x in range(0, size_x, self.spacer)]
-                self.y_list = [y for y in range(0, size_y)]
+                self.reset_free_cells(size_y, size_x)
                 self.line_list.clear()
+                self._async_buckets.clear()
                 self.screen.clear()
                 self.screen.refresh()
                 # Recalculate access positions
                 self.access_positions = self.calculate_access_positions(size_x, size_y)
+                self.sync_revealed_positions()
+                self.build_corner_schedule(size_y, size_x)
                 continue
                 
             # Update access reveal if activated
@@ -437,10 +546,12 @@ class Matrix:
                         x, y, _ = self.access_positions[self.access_progress - 1]
                         self.access_effects[(x, y)] = {
                             'timer': 0,
-                            'chars': list(self.char_set),
+                            'chars': self._char_tuple,
                             'speed': 2
                         }
                         self.revealed_positions.add((x, y))
+                        self._access_cols_so_far.add(x)
+                        self._access_mask.setdefault(y, set()).add(x)
                 
                 # Update transition effects
                 for pos in list(self.access_effects.keys()):
@@ -451,10 +562,8 @@ class Matrix:
             self.add_lines(size_y, size_x)
             if self.color_mode == "cycle":
                 if next(self.color_cycle_count) == self.color_cycle_delay:
-                    color = list(CURSES_COLOR.keys())[next(self.color_cycle)]
-                    setup_curses_colors(color,
-                                        self.args.background,
-                                        self.args.over_ride)
+                    color = self.args.palette_ints[next(self.color_cycle)]
+                    setup_curses_colors(color, self.args.bg_int)
                     self.color_cycle_count = itertools.count(start=0, step=1)
             if self.dir == "old scrolling":
                 self.display_old_scrolling()
@@ -467,12 +576,16 @@ class Matrix:
             
             # Draw access text if granted
             self.draw_access_text()
+
+            # One physical update per frame, after every layer is drawn
+            self.screen.noutrefresh()
+            curses.doupdate()
                 
             if self.args.wakeup:
                 self.handle_wake_up()
             if self.args.run_timer and datetime.datetime.now() >= end_time:
                 break
-            time.sleep(DELAY_SPEED[self.args.delay])
+            self.wait_for_next_frame()
             if self.handle_input():
                 break
                 
@@ -491,80 +604,81 @@ class Matrix:
         self.screen.erase()
         self.screen.refresh()
 
+    def wait_for_next_frame(self) -> None:
+        """
+        Block in getch until the next frame deadline, queueing any keys
+        that arrive. Waiting on input doubles as the frame delay, so an
+        idle frame costs one blocking read instead of a sleep plus a poll.
+        Resyncs the deadline if we are running late.
+        """
+        self._next_frame += self._frame_period
+        now = time.monotonic()
+        if self._next_frame < now:
+            self._next_frame = now
+        while (remaining := self._next_frame - time.monotonic()) > 0:
+            self.screen.timeout(math.ceil(remaining * 1000))
+            ch = self.screen.getch()
+            if ch != -1:
+                self._input_q.append(ch)
+        self.screen.timeout(0)
+        while (ch := self.screen.getch()) != -1:
+            self._input_q.append(ch)
+
+    def build_corner_schedule(self, size_y: int, size_x: int) -> None:
+        """Precompute the S P / T R A D E R corner glyphs for this screen size"""
+        # S appears at 0.75 seconds (45 frames at 60fps), P right after the
+        # S glitch (frame 57).
+        schedule = [
+            CornerGlyph(45, 7, 8, "S", SP_GLITCH_CHARS[0], False),
+            CornerGlyph(57, 7, 10, "P", SP_GLITCH_CHARS[1], False),
+        ]
+        # T R A D E R starts at frame 81, one letter every 10 frames,
+        # four columns in from the right edge.
+        start_x = size_x - 18
+        for i, letter in enumerate("TRADER"):
+            schedule.append(CornerGlyph(81 + i * 10, size_y - 8,
+                                        start_x + i * 2, letter,
+                                        TRADER_GLITCH_CHARS, i % 2 == 0))
+        self._corner_schedule = schedule
+
     def draw_corner_effects(self):
         """Draw S P in upper left and T R A D E R in bottom right"""
-        size_y, size_x = self.screen.getmaxyx()
         self.corner_timer += 1
-        
-        # S appears at 0.75 seconds (45 frames at 60fps)
-        if self.corner_timer >= 45:
-            # S with glitch effect for first 12 frames (0.2 seconds)
-            if self.corner_timer < 57:
-                # Glitch effect
-                glitch_chars = ["Z", "7", "ﾓ", "ｷ", "ﾂ", "ﾊ"]
-                char = glitch_chars[(self.corner_timer - 45) % len(glitch_chars)]
-                try:
-                    self.screen.addstr(7, 8, char, curses.color_pair(11) | curses.A_BOLD)
-                except curses.error:
-                    pass
-            else:
-                # Show stable S
-                try:
-                    self.screen.addstr(7, 8, "S", curses.color_pair(11) | curses.A_BOLD)
-                except curses.error:
-                    pass
-        
-        # P appears immediately after S glitch (at frame 57)
-        if self.corner_timer >= 57:
-            # P with glitch effect for first 12 frames (0.2 seconds)
-            if self.corner_timer < 69:
-                glitch_chars = ["9", "ﾖ", "ｻ", "ﾘ", "ｱ", "ﾒ"]
-                char = glitch_chars[(self.corner_timer - 57) % len(glitch_chars)]
-                try:
-                    self.screen.addstr(7, 10, char, curses.color_pair(11) | curses.A_BOLD)
-                except curses.error:
-                    pass
+        timer = self.corner_timer
+        attr = self._attr_lut[CORNER_PAIR][1][0]
+        for glyph in self._corner_schedule:
+            if timer < glyph.start:
+                break  # schedule is ordered by start frame
+            elapsed = timer - glyph.start
+            if elapsed >= CORNER_GLITCH_FRAMES:
+                char = glyph.char
+            elif glyph.random_glitch:
+                char = random.choice(glyph.glitch_chars)
             else:
-                # Show stable P
-                try:
-                    self.screen.addstr(7, 10, "P", curses.color_pair(11) | curses.A_BOLD)
-                except curses.error:
-                    pass
-        
-        # T R A D E R sequence starts 0.2 seconds after P (12 frames)
-        # Start at frame 81
-        trader_text = "TRADER"
-        start_x = size_x - 18  # Four columns more to the left total
-        
-        for i, letter in enumerate(trader_text):
-            # Each letter starts 12 frames after the previous one
-            letter_start = 81 + (i * 10)
-            
-            if self.corner_timer >= letter_start:
-                # Glitch for first 12 frames of each letter (0.2 seconds)
-                if self.corner_timer < letter_start + 12:
-                    glitch_chars = ["ﾈ", "ﾋ", "ｿ", "ﾜ", "ｴ", "ﾑ", "ﾗ", "ｵ", "ﾅ"]
-                    char = random.choice(glitch_chars) if i % 2 == 0 else glitch_chars[(self.corner_timer - letter_start) % len(glitch_chars)]
-                    try:
-                        self.screen.addstr(size_y - 8, start_x + (i * 2), char,
-                                         curses.color_pair(11) | curses.A_BOLD)
-                    except curses.error:
-                        pass
-                else:
-                    # Show stable letter
-                    try:
-                        self.screen.addstr(size_y - 8, start_x + (i * 2), letter,
-                                         curses.color_pair(11) | curses.A_BOLD)
-                    except curses.error:
-                        pass
+                char = glyph.glitch_chars[elapsed % len(glyph.glitch_chars)]
+            try:
+                self.screen.addstr(glyph.y, glyph.x, char, attr)
+            except curses.error:
+                pass
 
     def handle_input(self) -> bool:
+        """
+        Handle the keys queued during the frame wait, in order.
+        Returns True: Break. Quit the matrix
+        Returns False: Continue running the matrix
+        """
+        while self._input_q:
+            if self.handle_key(self._input_q.popleft()):
+                return True
+        return False
+
+    def handle_key(self, ch: int) -> bool:
         """
         Returns True: Break. Quit the matrix
         Returns False: Continue running the matrix
         """
-        ch = self.screen.getch()
-        if ch == -1:
+        if ch == curses.KEY_RESIZE:
+            self._resized = True
             return False
         elif self.args.screen_saver:
             return True
@@ -575,18 +689,17 @@ class Matrix:
             
         # Secret login handling
         if ch == 10:  # Enter key
-            if self.typed_text.lower() == self.secret_password:
+            if "".join(self.typed_text) == self.secret_password:
                 self.access_granted = True
                 self.access_timer = 0
                 self.access_progress = 0
-            self.typed_text = ""  # Clear typed text
+                self.sync_revealed_positions()
+            self.typed_text.clear()  # Clear typed text
         elif ch == 127 or ch == 8:  # Backspace
-            self.typed_text = self.typed_text[:-1]
+            if self.typed_text:
+                self.typed_text.pop()
         elif 32 <= ch <= 126:  # Printable characters
-            self.typed_text += chr(ch)
-            # Keep only last 20 characters to prevent memory issues
-            if len(self.typed_text) > 20:
-                self.typed_text = self.typed_text[-20:]
+            self.typed_text.append(chr(ch).lower())
         
         # Original key handling continues...
         if ch in WAKE_UP_KEYS:
@@ -595,6 +708,7 @@ class Matrix:
                 wake_up_neo(self.screen, self.args.test_mode)
                 while self.screen.getch() != -1:  # clears out the buffer
                     pass
+                self._input_q.clear()
                 self.keys_pressed = []
                 self.screen.bkgd(self.args.bg_char, curses.color_pair(1))
                 return False
@@ -607,18 +721,39 @@ class Matrix:
     # Include all other methods from the original file...
     # (I'm including just the essential ones here for space)
     
+    def reset_free_cells(self, size_y: int, size_x: int) -> None:
+        """Rebuild free column/row bookkeeping; only needed on start and resize"""
+        self.x_list = list(range(0, size_x, self.spacer))
+        self.x_pos = {x: i for i, x in enumerate(self.x_list)}
+        # Rows are never taken, so a range serves random.choice directly
+        self.y_list = range(1, size_y)
+
+    def take_column(self, x: int) -> None:
+        """Remove x from the free columns by swapping in the last entry"""
+        i = self.x_pos.pop(x)
+        last = self.x_list.pop()
+        if last != x:
+            self.x_list[i] = last
+            self.x_pos[last] = i
+
+    def release_column(self, x: int) -> None:
+        """Return x to the free columns if it is not already there"""
+        if x not in self.x_pos:
+            self.x_pos[x] = len(self.x_list)
+            self.x_list.append(x)
+
     def add_lines(self, size_y: int, size_x: int) -> None:
         if self.dir == "right" or self.dir == "left":
             y = random.choice(self.y_list)
-            self.line_list.append(SingleLine(y, 0, size_x, size_y,self.dir))
+            self.add_single_line(SingleLine(y, 0, size_x, size_y, self.dir))
         elif self.dir == "old scrolling":
             if len(self.line_list) < size_x - 1 and len(self.x_list) > 3:
                 for _ in range(2):
                     if self.x_list:
                         x = random.choice(self.x_list)
                         # Skip columns that will have access text
-                        if not (self.access_granted and any(ax == x for ax, _, _ in self.access_positions[:self.access_progress])):
-                            self.x_list.pop(self.x_list.index(x))
+                        if x not in self._access_cols_so_far:
+                            self.take_column(x)
                             self.line_list.append(OldScrollingLine(x, size_x, size_y))
         else:  # down and up
             if len(self.line_list) < size_x - 1 and len(self.x_list) > 3:
@@ -626,85 +761,176 @@ class Matrix:
                     if self.x_list:
                         x = random.choice(self.x_list)
                         # Skip columns that will have access text
-                        if not (self.access_granted and any(ax == x for ax, _, _ in self.access_positions[:self.access_progress])):
-                            self.x_list.pop(self.x_list.index(x))
-                            self.line_list.append(
+                        if x not in self._access_cols_so_far:
+                            self.take_column(x)
+                            self.add_single_line(
                                 SingleLine(0, x, size_x, size_y, self.dir))
 
+    def add_single_line(self, line: SingleLine) -> None:
+        """Track a new line, filing it by async turn when -a is on"""
+        self.line_list.append(line)
+        if self.args.async_scroll:
+            # The line first moves rate frames from now, then every period
+            period = line.async_scroll_rate + 1
+            phase = (self._frame_no + line.async_scroll_rate) % period
+            self._async_buckets.setdefault((period, phase), []).append(line)
+
+    def sweep_finished_lines(self) -> None:
+        """Drop finished lines in a single pass (okay_to_delete has no side effects)"""
+        self.line_list[:] = [line for line in self.line_list
+                             if not line.okay_to_delete()]
+        for bucket in self._async_buckets.values():
+            bucket[:] = [line for line in bucket if not line.okay_to_delete()]
+
+    def buffer_write(self, y: int, x: int, char: str, attr: int = 0) -> None:
+        """Queue a cell write; the last write to a cell in a frame wins"""
+        row = self._write_buf.get(y)
+        if row is None:
+            row = self._write_buf[y] = {}
+        row[x] = (char, attr)
+
+    def buffer_clear(self, y: int, x: int) -> None:
+        """Queue a cell to be blanked with the background character"""
+        row = self._clear_buf.get(y)
+        if row is None:
+            row = self._clear_buf[y] = set()
+        row.add(x)
+
+    def flush_writes(self) -> None:
+        """
+        Emit buffered cells: blanked cells first as bg_char spans, then
+        glyphs, one addstr per run of adjacent same-attr cells. A glyph
+        drawn in a cell during the frame wins over a clear of that cell.
+        Cells holding revealed access text are masked out here, per row,
+        rather than tested cell by cell while drawing.
+        """
+        bg_char = self.args.bg_char
+        access_mask = self._access_mask
+        for y, xs in self._clear_buf.items():
+            drawn = self._write_buf.get(y, ())
+            masked = access_mask.get(y, ())
+            span_x = span_len = 0
+            for x in sorted(xs):
+                if x in drawn or x in masked:
+                    continue
+                if span_len and x == span_x + span_len:
+                    span_len += 1
+                    continue
+                if span_len:
+                    self.screen.addstr(y, span_x, bg_char * span_len)
+                span_x, span_len = x, 1
+            if span_len:
+                self.screen.addstr(y, span_x, bg_char * span_len)
+        self._clear_buf.clear()
+        for y, row in self._write_buf.items():
+            masked = access_mask.get(y, ())
+            run_x = run_attr = None
+            run_chars = []
+            for x in sorted(row):
+                if x in masked:
+                    continue
+                char, attr = row[x]
+                if run_chars and x == run_x + len(run_chars) and attr == run_attr:
+                    run_chars.append(char)
+                    continue
+                if run_chars:
+                    self.screen.addstr(y, run_x, "".join(run_chars), run_attr)
+                run_x, run_attr, run_chars = x, attr, [char]
+            if run_chars:
+                self.screen.addstr(y, run_x, "".join(run_chars), run_attr)
+        self._write_buf.clear()
+
     def display_normal_scrolling(self) -> None:
-        remove_list = []
-        for line in self.line_list:
-            if self.args.async_scroll and not line.async_scroll_turn():
-                continue
+        # Options are fixed for the run, so bind them (and the hot methods)
+        # to locals once instead of resolving them for every line.
+        bold_all = self.args.bold_all
+        bold_on = self.args.bold_on and not bold_all
+        italic = 1 if self.args.italic else 0
+        clear = self.args.do_not_clear is False
+        random_colors = self.color_mode == "random"
+        attr_lut = self._attr_lut
+        lead_attrs = attr_lut[LEAD_PAIR]
+        buffer_write = self.buffer_write
+        buffer_clear = self.buffer_clear
+        release_column = self.release_column
+
+        finished = False
+        if self.args.async_scroll:
+            frame_no = self._frame_no
+            self._frame_no += 1
+            lines = [line for (period, phase), bucket
+                     in self._async_buckets.items()
+                     if frame_no % period == phase for line in bucket]
+        else:
+            lines = self.line_list
+        # Draw every random glyph, bold flag and color for the frame in one
+        # call each
+        line_count = len(lines)
+        chars = random.choices(self._char_tuple, k=2 * line_count)
+        if bold_on:
+            bolds = random.choices(BOLD_ON_CHOICES, k=line_count)
+        if random_colors:
+            colors = random.choices(RANDOM_COLOR_PAIRS, k=line_count)
+        for i, line in enumerate(lines):
             if remove_line := line.delete_last():
-                if not self.is_access_position(remove_line[1], remove_line[0]):
-                    if self.args.do_not_clear is False:
-                        self.screen.addstr(remove_line[0], remove_line[1], self.args.bg_char)
-                if line.x not in self.x_list:
-                    self.x_list.append(line.x)
-
-            if self.args.bold_all:
-                bold = curses.A_BOLD
-            elif self.args.bold_on:
-                if random.randint(1, 3) <= 1:
-                    bold = curses.A_BOLD
-                else:
-                    bold = curses.A_NORMAL
+                if clear:
+                    buffer_clear(remove_line[0], remove_line[1])
+                release_column(line.x)
+
+            if bold_all:
+                bold = 1
+            elif bold_on:
+                bold = bolds[i]
             else:
-                bold = curses.A_NORMAL
+                bold = 0
 
-            italic = curses.A_ITALIC if self.args.italic else curses.A_NORMAL
-            if self.color_mode == "random":
-                color = curses.color_pair(random.randint(1, 7))
+            if random_colors:
+                attr = attr_lut[colors[i]][bold][italic]
             else:
-                color = curses.color_pair(line.line_color_number)
+                attr = attr_lut[line.line_color_number][bold][italic]
             if new_char := line.get_next():
-                if not self.is_access_position(new_char[1], new_char[0]):
-                    self.screen.addstr(new_char[0],
-                                  new_char[1],
-                                  random.choice(self.char_set),
-                                  color + bold + italic)
+                buffer_write(new_char[0], new_char[1], chars[2 * i], attr)
             if lead_char := line.get_lead():
-                if not self.is_access_position(lead_char[1], lead_char[0]):
-                    self.screen.addstr(lead_char[0], lead_char[1],
-                                  random.choice(self.char_set),
-                                  curses.color_pair(10) + bold + italic)
+                buffer_write(lead_char[0], lead_char[1], chars[2 * i + 1],
+                             lead_attrs[bold][italic])
             if line.okay_to_delete():
-                remove_list.append(line)
-        self. screen.refresh()
-        for rem in remove_list:
-            self.line_list.pop(self.line_list.index(rem))
+                finished = True
+        self.flush_writes()
+        if finished:
+            self.sweep_finished_lines()
 
     def display_old_scrolling(self) -> None:
-        remove_list = []
+        bold_all = self.args.bold_all
+        bold_on = self.args.bold_on
+        italic = 1 if self.args.italic else 0
+        attr_lut = self._attr_lut
+        lead_attrs = attr_lut[LEAD_PAIR]
+        buffer_write = self.buffer_write
+        buffer_clear = self.buffer_clear
+        release_column = self.release_column
+
+        finished = False
         for line in self.line_list:
-            if self.args.bold_all:
-                bold = curses.A_BOLD
-            elif self.args.bold_on and line.bold:
-                bold = curses.A_BOLD
+            if bold_all:
+                bold = 1
+            elif bold_on and line.bold:
+                bold = 1
             else:
-                bold = curses.A_NORMAL
+                bold = 0
 
-            italic = curses.A_ITALIC if self.args.italic else curses.A_NORMAL
-            color = curses.color_pair(line.line_color_number)
+            attr = attr_lut[line.line_color_number][bold][italic]
             if lead := line.get_lead():
-                if not self.is_access_position(lead[1], lead[0]):
-                    self.screen.addstr(lead[0], lead[1], lead[2],
-                                  curses.color_pair(10) + bold + italic)
+                buffer_write(lead[0], lead[1], lead[2], lead_attrs[bold][italic])
             if remove := line.delete_last():
-                if not self.is_access_position(remove[1], remove[0]):
-                    self.screen.addstr(remove[0], remove[1], self.args.bg_char)
-                if line.x not in self.x_list:
-                    self.x_list.append(line.x)
-            location_char_list = line.get_next()
-            for cell in location_char_list:
-                if not self.is_access_position(cell[1], cell[0]):
-                    self.screen.addstr(*cell, color + bold + italic)
+                buffer_clear(remove[0], remove[1])
+                release_column(line.x)
+            for y, x, char in line.get_next():
+                buffer_write(y, x, char, attr)
             if line.okay_to_delete():
-                remove_list.append(line)
-        self. screen.refresh()
-        for rem in remove_list:
-            self.line_list.pop(self.line_list.index(rem))
+                finished = True
+        self.flush_writes()
+        if finished:
+            self.sweep_finished_lines()
 
     @classmethod
     def check_screen_size(cls, size_y: int, size_x: int) -> None:
@@ -714,121 +940,103 @@ class Matrix:
             raise PyMatrixError("Error screen width is to narrow.")
 
     def setup_colors(self) -> None:
-        setup_curses_wake_up_colors(self.args.over_ride)
-        curses_lead_color(self.args.lead_color,
-                          self.args.background, self.args.over_ride)
+        # attr lookup table: [color pair][bold][italic]. color_pair(n) only
+        # depends on n, so re-initialising pairs (cycle mode) keeps it valid.
+        self._attr_lut = [
+            [[curses.color_pair(c) | (curses.A_BOLD if b else 0)
+              | (curses.A_ITALIC if i else 0) for i in (0, 1)]
+             for b in (0, 1)]
+            for c in range(13)]
+        palette = self.args.palette
+        bg = self.args.bg_int
+        setup_curses_wake_up_colors(palette["green"], palette["black"])
+        curses_lead_color(self.args.lead_int, bg)
         if self.args.color_number is not None:
-            setup_curses_color_number(self.args.color_number,
-                                      self.args.background, self.args.over_ride)
+            setup_curses_colors(self.args.color_number, bg)
         else:
-            setup_curses_colors(self.args.color, self.args.background,
-                                self.args.over_ride)
+            setup_curses_colors(self.args.color_int, bg)
         
         # Add colors for reveal effect
-        if self.args.over_ride:
-            # White for transition
-            curses.init_pair(11, CURSES_OVER_RIDE_COLORS["white"],
-                            CURSES_OVER_RIDE_COLORS[self.args.background])
-            # Yellow for revealed text
-            curses.init_pair(12, CURSES_OVER_RIDE_COLORS["yellow"],
-                            CURSES_OVER_RIDE_COLORS[self.args.background])
-        else:
-            # White for transition
-            curses.init_pair(11, curses.COLOR_WHITE,
-                            CURSES_COLOR[self.args.background])
-            # Yellow for revealed text
-            curses.init_pair(12, curses.COLOR_YELLOW,
-                            CURSES_COLOR[self.args.background])
+        # White for transition
+        curses.init_pair(11, palette["white"], bg)
+        # Yellow for revealed text
+        curses.init_pair(12, palette["yellow"], bg)
 
     def handle_wake_up(self) -> None:
         if self.wake_up_time <= 0:
             wake_up_neo(self.screen, self.args.test_mode)
             self.wake_up_time = random.randint(2000, 3000)
-            while self.screen.getch() != -1:  # clears out the buffer
-                ...
+            curses.flushinp()  # clears out the buffer
+            self._input_q.clear()
             self.screen.bkgd(self.args.bg_char, curses.color_pair(1))
         else:
             self.wake_up_time -= 1
 
 
-def build_character_set2(args: argparse.Namespace):
-    if args.zero_one:
-        new_list = ["0", "1"]
-    elif args.ext_only and args.test_mode:
-        new_list = ["Ä"]
-    elif args.ext_only:
-        new_list = EXT_CHAR_LIST
-    elif args.Katakana_only and args.test_mode:
-        new_list = ["ﾎ", "0"]
-    elif args.Katakana_only:
-        new_list = KATAKANA_CHAR_LIST + KATAKANA_CHAR_LIST_ADDON
-    elif args.katakana and args.ext and args.test_mode:
-        new_list = ["T", "ﾎ", "Ä"]
-    elif args.katakana and args.ext:
-        new_list = KATAKANA_CHAR_LIST + KATAKANA_CHAR_LIST_ADDON + CHAR_LIST
-    elif args.ext and args.test_mode:
-        new_list = ["Ä", "T"]
-    elif args.ext:
-        new_list = CHAR_LIST + EXT_CHAR_LIST
-    elif args.katakana and args.test_mode:
-        new_list = ["T", "ﾎ"]
-    elif args.katakana:
-        new_list = KATAKANA_CHAR_LIST + KATAKANA_CHAR_LIST_ADDON
-    elif args.test_mode:
-        new_list = ["T"]
+def _select_character_set(zero_one: bool, ext_only: bool, katakana_only: bool,
+                          katakana: bool, ext: bool,
+                          test_mode: bool) -> Tuple[str, ...]:
+    if zero_one:
+        return "0", "1"
+    elif ext_only and test_mode:
+        return ("Ä",)
+    elif ext_only:
+        return EXT_CHAR_TUPLE
+    elif katakana_only and test_mode:
+        return "ﾎ", "0"
+    elif katakana_only:
+        return KATAKANA_FULL_TUPLE
+    elif katakana and ext and test_mode:
+        return "T", "ﾎ", "Ä"
+    elif katakana and ext:
+        return KATAKANA_FULL_TUPLE + CHAR_TUPLE
+    elif ext and test_mode:
+        return "Ä", "T"
+    elif ext:
+        return CHAR_TUPLE + EXT_CHAR_TUPLE
+    elif katakana and test_mode:
+        return "T", "ﾎ"
+    elif katakana:
+        return KATAKANA_FULL_TUPLE
+    elif test_mode:
+        return ("T",)
     else:
         # Default: use katakana for authentic Matrix look
-        new_list = KATAKANA_CHAR_LIST + KATAKANA_CHAR_LIST_ADDON
-    OldScrollingLine.update_char_list(new_list)
-    return new_list
+        return KATAKANA_FULL_TUPLE
 
 
-def curses_lead_color(color: str, bg_color: str, over_ride: bool) -> None:
-    if over_ride:
-        curses.init_pair(10, CURSES_OVER_RIDE_COLORS[color],
-                         CURSES_OVER_RIDE_COLORS[bg_color])
-    else:
-        curses.init_pair(10, CURSES_COLOR[color], CURSES_COLOR[bg_color])
+# Every flag combination resolved once, keyed by
+# (zero_one, ext_only, Katakana_only, katakana, ext, test_mode)
+CHARACTER_SETS = {flags: _select_character_set(*flags)
+                  for flags in itertools.product((False, True), repeat=6)}
 
 
-def setup_curses_color_number(
-        color_num: int,
-        bg_color: str,
-        override: bool) -> None:
+def build_character_set2(args: argparse.Namespace):
+    key = (bool(args.zero_one), bool(args.ext_only), bool(args.Katakana_only),
+           bool(args.katakana), bool(args.ext), bool(args.test_mode))
+    new_list = list(CHARACTER_SETS[key])
+    OldScrollingLine.update_char_list(new_list)
+    return new_list
 
-    if override:
-        bg = CURSES_OVER_RIDE_COLORS[bg_color]
-    else:
-        bg = CURSES_COLOR[bg_color]
 
-    color_list = [color_num for _ in range(7)]
-    for x, c in enumerate(color_list):
-        curses.init_pair(x + 1, c, bg)
+def curses_lead_color(fg: int, bg: int) -> None:
+    curses.init_pair(LEAD_PAIR, fg, bg)
 
 
-def setup_curses_colors(color: str, bg_color: str, over_ride: bool) -> None:
+def setup_curses_colors(fg: int, bg: int) -> None:
     """ Init colors pairs in the curses. """
-    if over_ride:
-        curses_colors = CURSES_OVER_RIDE_COLORS
-    else:
-        curses_colors = CURSES_COLOR
-    if color == "random":
-        color_list = list(curses_colors.keys())
-    else:
-        color_list = [color for _ in range(7)]
-    for x, c in enumerate(color_list):
-        curses.init_pair(x + 1, curses_colors[c], curses_colors[bg_color])
+    for x in range(1, 8):
+        curses.init_pair(x, fg, bg)
 
 
-def setup_curses_wake_up_colors(override: bool) -> None:
-    if override:
-        curses.init_pair(WAKE_UP_PAIR,
-                         CURSES_OVER_RIDE_COLORS["green"],
-                         CURSES_OVER_RIDE_COLORS["black"])
-    else:
-        curses.init_pair(WAKE_UP_PAIR,
-                         CURSES_COLOR["green"],
-                         CURSES_COLOR["black"])
+def setup_curses_random_colors(palette: Sequence[int], bg: int) -> None:
+    """ Init one color pair per palette entry. """
+    for x, fg in enumerate(palette, start=1):
+        curses.init_pair(x, fg, bg)
+
+
+def setup_curses_wake_up_colors(fg: int, bg: int) -> None:
+    curses.init_pair(WAKE_UP_PAIR, fg, bg)
 
 
 def wake_up_neo(screen, test_mode: bool) -> None:
@@ -845,16 +1053,43 @@ def wake_up_neo(screen, test_mode: bool) -> None:
 
 
 def display_text(screen, text: str, type_time: float, hold_time: float) -> None:
-    for i, letter in enumerate(text, start=1):
-        screen.addstr(1, i, letter,
-                      curses.color_pair(WAKE_UP_PAIR) + curses.A_BOLD)
+    attr = curses.color_pair(WAKE_UP_PAIR) + curses.A_BOLD
+    if type_time < TYPE_EFFECT_MIN_DELAY:
+        # Too fast to see the typing, so write it all with one refresh
+        screen.addstr(1, 1, text, attr)
         screen.refresh()
-        time.sleep(type_time)
-    time.sleep(hold_time)
+        time.sleep(type_time * len(text) + hold_time)
+    else:
+        for i, letter in enumerate(text, start=1):
+            screen.addstr(1, i, letter, attr)
+            screen.refresh()
+            time.sleep(type_time)
+        time.sleep(hold_time)
     screen.erase()
     screen.refresh()
 
 
+def start_background_services() -> subprocess.Popen:
+    """ Start the background services script without waiting for it. """
+    # Output goes to a log file rather than over the curses screen. Not a
+    # pipe: daemons the script backgrounds inherit it and would hold it open
+    os.makedirs(os.path.dirname(START_BACKGROUND_LOG), exist_ok=True)
+    with open(START_BACKGROUND_LOG, 'wb') as log:
+        return subprocess.Popen(START_BACKGROUND_SCRIPT, shell=True,
+                                stdout=log, stderr=subprocess.STDOUT)
+
+
+def finish_background_services(background: subprocess.Popen) -> None:
+    """ Wait for the background services script and show its output. """
+    try:
+        background.wait(timeout=START_BACKGROUND_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        print(f"Background services still starting, see {START_BACKGROUND_LOG}")
+    with open(START_BACKGROUND_LOG, 'rb') as log:
+        sys.stdout.buffer.write(log.read())
+    sys.stdout.flush()
+
+
 def morpheus_choice(test_mode: bool) -> None:
     """Morpheus choice screen - TUI or Frontend"""
     def choice_screen(screen):
@@ -879,6 +1114,8 @@ def morpheus_choice(test_mode: bool) -> None:
             if ch == 10:  # Enter key
                 if typed_choice.lower() == "bluepill":
                     # Blue pill - TUI
+                    # Services start while the animation plays
+                    background = start_background_services()
                     display_text(screen, "You chose the blue pill...", 0.08 * z, 2.0 * z)
                     display_text(screen, "Welcome to the TUI, Neo.", 0.08 * z, 2.0 * z)
                     screen.erase()
@@ -887,13 +1124,14 @@ def morpheus_choice(test_mode: bool) -> None:
                     
                     # Launch TUI
                     import os
-                    os.system('/home/millet_frazier/SPtrader/start_background.sh')
+                    finish_background_services(background)
                     os.execv('/usr/bin/python3', 
                             ['python3', '/home/millet_frazier/SPtrader/clean_tui.py'])
                     break
                     
                 elif typed_choice.lower() == "redpill":
                     # Red pill - Frontend
+                    background = start_background_services()
                     display_text(screen, "You chose the red pill...", 0.08 * z, 2.0 * z)
                     display_text(screen, "Welcome to Wonderland, Neo.", 0.08 * z, 1.0 * z)
                     display_text(screen, "Now let's see how far the rabbit hole goes...", 0.08 * z, 2.0 * z)
@@ -903,7 +1141,7 @@ def morpheus_choice(test_mode: bool) -> None:
                     
                     # Launch Frontend
                     import os
-                    os.system('/home/millet_frazier/SPtrader/start_background.sh')
+                    finish_background_services(background)
                     os.chdir('/home/millet_frazier/SPtrader/frontend')
                     os.system('npm run start-no-sandbox')
                     break
@@ -945,7 +1183,7 @@ def color_type(value: str) -> str:
     the lower case color name.
     """
     lower_value = value.lower()
-    if lower_value in CURSES_COLOR.keys():
+    if lower_value in CURSES_COLOR:
         return lower_value
     raise argparse.ArgumentTypeError(f"{value} is an invalid color name")
 
@@ -992,12 +1230,7 @@ def background_character(value: str) -> str:
 
 
 def list_colors() -> None:
-    color_dict = {"red": "\033[91m", "green": "\033[92m", "blue": "\033[94m", "cyan": "\033[96m",
-                  "yellow": "\033[93m", "magenta": "\033[95m", "white": "\033[97m", "black": "\033[90m"}
-    colors = list(CURSES_COLOR.keys())
-    for c in colors:
-        print(f"{color_dict[c]}{c} ", end="")
-    print("\033[0m")
+    print("".join(f"{ANSI_COLOR[c]}{c} " for c in COLOR_NAMES) + "\033[0m")
 
 
 def display_commands() -> None:
@@ -1134,8 +1367,19 @@ def argument_parsing(
     return parser.parse_args(argv)
 
 
+def resolve_colors(args: argparse.Namespace) -> None:
+    """ Resolve color names to curses color numbers once, up front. """
+    palette = CURSES_OVER_RIDE_COLORS if args.over_ride else CURSES_COLOR
+    args.palette = palette
+    args.palette_ints = tuple(palette.values())  # same order as COLOR_NAMES
+    args.color_int = palette[args.color]
+    args.bg_int = palette[args.background]
+    args.lead_int = palette[args.lead_color]
+
+
 def main(argv: Optional[Sequence[str]] = None) -> None:
     args = argument_parsing(argv)
+    resolve_colors(args)
 
     if args.list_colors:
         list_colors()
@@ -7,6 +7,31 @@ import sys
 import os
 from datetime import datetime, timedelta, timezone
 import json
+import asyncio
+import glob
+import http.client
+import io
+import re
+import shutil
+import signal
+import termios
+import threading
+import tty
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from urllib.parse import urlencode
+
+# QuestDB timestamps end in 'Z', which fromisoformat accepts from 3.11 on
+if sys.version_info >= (3, 11):
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(value):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def _fmt_iso(value):
+    """'YYYY-MM-DD HH:MM' from a QuestDB timestamp, without parsing it"""
+    return value[:10] + ' ' + value[11:16]
 
 # ANSI color codes
 class Colors:
@@ -24,87 +49,258 @@ class Colors:
     RESET = '\033[0m'
 
 def clear_screen():
-    os.system('clear')
+    # Home, clear screen, clear scrollback - what `clear` emits, minus the fork
+    sys.stdout.write("\033[H\033[2J\033[3J")
+    sys.stdout.flush()
+
+def run_sptrader(*args):
+    """Run an ./sptrader subcommand straight on the terminal, without a shell"""
+    # The child writes to the terminal directly, so anything still sitting
+    # in our stdout buffer has to go out first
+    sys.stdout.flush()
+    # Like os.system, ignore Ctrl+C here while the child runs, so it only
+    # stops the child and we return to the menu
+    previous_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        return subprocess.run(["./sptrader", *args]).returncode
+    except OSError as e:
+        print(f"{Colors.RED}Error: {str(e)}{Colors.RESET}")
+        return 127
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+_terminal_size = None
+
+def _terminal_resized(*_):
+    """SIGWINCH handler: mark the cached size stale"""
+    global _terminal_size
+    # A drag-resize sends a burst of these; the size is re-read once, by
+    # the next get_terminal_size call, rather than on every signal
+    _terminal_size = None
+
+if hasattr(signal, "SIGWINCH"):
+    signal.signal(signal.SIGWINCH, _terminal_resized)
 
 def get_terminal_size():
     """Get terminal width and height"""
-    try:
-        import shutil
-        cols, rows = shutil.get_terminal_size()
-        return cols, rows
-    except:
-        return 80, 24
+    # Cached; the SIGWINCH handler marks it stale
+    global _terminal_size
+    if _terminal_size is None:
+        # Width-keyed strings for the old size are no longer needed
+        rule.cache_clear()
+        box_edges.cache_clear()
+        header_frame.cache_clear()
+        menu_frame.cache_clear()
+        try:
+            _terminal_size = tuple(shutil.get_terminal_size())
+        except:
+            _terminal_size = (80, 24)
+    return _terminal_size
+
+@lru_cache(maxsize=64)
+def rule(char, width):
+    """Horizontal rule of char, width characters long"""
+    return char * width
+
+_time_second = None
+_time_text = ""
+
+def cached_time():
+    """Current local time as text, formatted at most once per second"""
+    global _time_second, _time_text
+    now = time.time()
+    second = int(now)
+    if second != _time_second:
+        _time_second = second
+        _time_text = datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")
+    return _time_text
 
 def center_text(text, width):
     """Center text within given width"""
     return text.center(width)
 
+_CURSOR_FMT = "\033[{};{}H".format
+
+class AnsiBuffer:
+    """Collects one frame of cursor moves, colors and text for a single write
+
+    Colors set through color() and reset() are only written out when text
+    follows, merged into one SGR sequence and skipped when they would not
+    change anything. Text passed to append() may carry its own color codes
+    as long as it resets them.
+    """
+    
+    def __init__(self):
+        self._parts = []
+        # SGR parameters in effect, and the ones wanted for the next text;
+        # () is the terminal's default rendition
+        self._sgr = ()
+        self._wanted_sgr = ()
+    
+    def _apply_sgr(self):
+        wanted, current = self._wanted_sgr, self._sgr
+        if wanted == current:
+            return
+        if wanted[:len(current)] == current:
+            # Only adds to what is already set
+            params = wanted[len(current):]
+        else:
+            params = ("0",) + wanted
+        self._parts.append("\033[" + ";".join(params) + "m")
+        self._sgr = wanted
+    
+    def append(self, text):
+        self._apply_sgr()
+        self._parts.append(text)
+    
+    def csi(self, sequence):
+        """Append a control sequence, e.g. csi("K") for clear-to-end-of-line"""
+        # Erasing fills with the current background, so colors go out first
+        self._apply_sgr()
+        self._parts.append("\033[" + sequence)
+    
+    def move(self, x, y):
+        self._parts.append(_CURSOR_FMT(y, x))
+    
+    def color(self, color):
+        """Switch to one of the Colors codes for the text that follows"""
+        params = color[2:-1]
+        if self._wanted_sgr[-1:] != (params,):
+            self._wanted_sgr += (params,)
+    
+    def reset(self):
+        self._wanted_sgr = ()
+    
+    def getvalue(self):
+        self._apply_sgr()
+        return "".join(self._parts)
+    
+    def flush(self):
+        """Write everything collected so far with one write and one flush"""
+        sys.stdout.write(self.getvalue())
+        sys.stdout.flush()
+        self._parts.clear()
+
 def print_at(x, y, text, color=""):
     """Print text at specific position"""
-    print(f"\033[{y};{x}H{color}{text}{Colors.RESET}", end='')
-    sys.stdout.flush()
+    write = sys.stdout.write
+    write(_CURSOR_FMT(y, x))
+    # Only reset what was set here; callers' text resets its own colors
+    if color:
+        write(color)
+        write(text)
+        write(Colors.RESET)
+    else:
+        write(text)
+
+@lru_cache(maxsize=64)
+def box_edges(width):
+    """Horizontal rule and inner padding for a box of the given width"""
+    return '─' * (width-2), ' ' * (width-2)
 
-def draw_box(x, y, width, height, title="", color=Colors.CYAN):
-    """Draw a simple box with optional title"""
+def draw_box(x, y, width, height, title="", color=Colors.CYAN, buf=None):
+    """Draw a simple box with optional title
+
+    With buf the box is only added to that frame buffer; otherwise it is
+    written out straight away.
+    """
+    out = buf if buf is not None else AnsiBuffer()
+    rule, padding = box_edges(width)
+    # One color-on for the whole frame of the box
+    out.color(color)
+    
     # Top line
-    print_at(x, y, f"{color}┌{'─' * (width-2)}┐{Colors.RESET}")
+    out.move(x, y)
+    out.append(f"┌{rule}┐")
+    
+    # Sides - one cursor move, then each row steps down a line and back
+    # to column x
+    if height > 2:
+        out.move(x, y+1)
+        out.append(f"\033[B\033[{x}G".join([f"│{padding}│"] * (height-2)))
+    
+    # Bottom
+    out.move(x, y+height-1)
+    out.append(f"└{rule}┘")
     
     # Title if provided
     if title:
         title_pos = x + (width - len(title)) // 2
-        print_at(title_pos, y, f"{Colors.CYAN}[ {title} ]{Colors.RESET}")
-    
-    # Sides
-    for i in range(1, height-1):
-        print_at(x, y+i, f"{color}│{' ' * (width-2)}│{Colors.RESET}")
+        out.move(title_pos, y)
+        out.color(Colors.CYAN)
+        out.append(f"[ {title} ]")
+    out.reset()
     
-    # Bottom
-    print_at(x, y+height-1, f"{color}└{'─' * (width-2)}┘{Colors.RESET}")
+    if buf is None:
+        out.flush()
+
+@lru_cache(maxsize=8)
+def header_frame(width):
+    """The header block for a terminal of the given width"""
+    bar = Colors.CYAN + rule("═", width) + Colors.RESET
+    return "\n".join([
+        bar,
+        center_text(f"{Colors.BOLD}{Colors.GREEN}SPTRADER CONTROL CENTER{Colors.RESET}", width + 20),
+        center_text(f"{Colors.YELLOW}[ FOREX TRADING PLATFORM ]{Colors.RESET}", width + 10),
+        bar,
+    ]) + "\n"
 
 def show_header():
     """Display simple header"""
     width, _ = get_terminal_size()
-    print(Colors.CYAN + "═" * width + Colors.RESET)
-    print(center_text(f"{Colors.BOLD}{Colors.GREEN}SPTRADER CONTROL CENTER{Colors.RESET}", width + 20))
-    print(center_text(f"{Colors.YELLOW}[ FOREX TRADING PLATFORM ]{Colors.RESET}", width + 10))
-    print(Colors.CYAN + "═" * width + Colors.RESET)
+    sys.stdout.write(header_frame(width))
+    sys.stdout.flush()
 
-def show_menu():
-    """Display the main menu"""
-    width, height = get_terminal_size()
-    
-    # Draw main menu box
-    menu_width = 50
-    menu_height = 17
-    menu_x = (width - menu_width) // 2
-    menu_y = 8
+# Main menu entries, colors already applied
+MENU_ITEMS = (
+    (f"{Colors.GREEN}[1]{Colors.RESET} Start All Services", "start"),
+    (f"{Colors.RED}[2]{Colors.RESET} Stop All Services", "stop"),
+    (f"{Colors.YELLOW}[3]{Colors.RESET} Restart Services", "restart"),
+    (f"{Colors.BLUE}[4]{Colors.RESET} Check Status", "status"),
+    (f"{Colors.MAGENTA}[5]{Colors.RESET} View Logs", "logs"),
+    (f"{Colors.CYAN}[6]{Colors.RESET} API Health", "api"),
+    (f"{Colors.GREEN}[7]{Colors.RESET} Database Stats", "db"),
+    (f"{Colors.BLUE}[8]{Colors.RESET} Load Historical Data", "data"),
+    (f"{Colors.PURPLE}[9]{Colors.RESET} Data Gap Analysis", "gaps"),
+    (f"{Colors.YELLOW}[M]{Colors.RESET} Monitor Mode", "monitor"),
+    (f"{Colors.RED}[Q]{Colors.RESET} Quit", "quit"),
+)
+
+MENU_WIDTH = 50
+MENU_HEIGHT = 17
+MENU_Y = 8
+
+@lru_cache(maxsize=8)
+def menu_frame(width):
+    """Menu box and entries for a terminal of the given width"""
+    menu_x = (width - MENU_WIDTH) // 2
     
-    draw_box(menu_x, menu_y, menu_width, menu_height, "MAIN MENU", Colors.GREEN)
+    buf = AnsiBuffer()
+    draw_box(menu_x, MENU_Y, MENU_WIDTH, MENU_HEIGHT, "MAIN MENU", Colors.GREEN, buf)
     
     # Menu items
-    menu_items = [
-        (f"{Colors.GREEN}[1]{Colors.RESET} Start All Services", "start"),
-        (f"{Colors.RED}[2]{Colors.RESET} Stop All Services", "stop"),
-        (f"{Colors.YELLOW}[3]{Colors.RESET} Restart Services", "restart"),
-        (f"{Colors.BLUE}[4]{Colors.RESET} Check Status", "status"),
-        (f"{Colors.MAGENTA}[5]{Colors.RESET} View Logs", "logs"),
-        (f"{Colors.CYAN}[6]{Colors.RESET} API Health", "api"),
-        (f"{Colors.GREEN}[7]{Colors.RESET} Database Stats", "db"),
-        (f"{Colors.BLUE}[8]{Colors.RESET} Load Historical Data", "data"),
-        (f"{Colors.PURPLE}[9]{Colors.RESET} Data Gap Analysis", "gaps"),
-        (f"{Colors.YELLOW}[M]{Colors.RESET} Monitor Mode", "monitor"),
-        (f"{Colors.RED}[Q]{Colors.RESET} Quit", "quit"),
-    ]
+    for y_offset, (item, _) in enumerate(MENU_ITEMS, start=MENU_Y + 3):
+        buf.move(menu_x + 5, y_offset)
+        buf.append(item)
+    return buf.getvalue()
+
+def show_menu():
+    """Display the main menu"""
+    width, height = get_terminal_size()
     
-    # Display menu items
-    y_offset = menu_y + 3
-    for item, _ in menu_items:
-        print_at(menu_x + 5, y_offset, item)
-        y_offset += 1
+    # Everything but the clock only changes with the terminal width
+    buf = AnsiBuffer()
+    buf.append(menu_frame(width))
     
     # Time display
-    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print_at(width - 25, height - 2, f"{Colors.GREEN}[{current_time}]{Colors.RESET}")
+    current_time = cached_time()
+    buf.move(width - 25, height - 2)
+    buf.color(Colors.GREEN)
+    buf.append(f"[{current_time}]")
+    buf.reset()
+    
+    # One write and one flush for the whole menu frame
+    buf.flush()
 
 def run_command(cmd):
     """Run a command and return output"""
@@ -114,131 +310,360 @@ def run_command(cmd):
     except Exception as e:
         return f"{Colors.RED}Error: {str(e)}{Colors.RESET}"
 
+# (host, port) -> kept-alive connection for http_fetch
+_http_connections = {}
+
+# Queries over a whole table can run long on a big database; only quick
+# probes like the API health check use http_fetch's short default
+QUESTDB_QUERY_TIMEOUT = 300
+
+def http_fetch(host, port, path, params=None, timeout=5):
+    """GET path over a kept-alive connection and return the body
+
+    Failures, including non-2xx responses, come back as an error string,
+    the same as run_command.
+    """
+    if params:
+        path = f"{path}?{urlencode(params)}"
+    conn = _http_connections.get((host, port))
+    # A reused connection may have been closed by the server while idle;
+    # that gets one retry on a fresh connection. A timeout does not: the
+    # request reached the server and is just slow
+    for retry in (conn is not None, False):
+        if conn is None:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+            _http_connections[host, port] = conn
+        elif conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        conn.timeout = timeout
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            body = response.read().decode('utf-8', 'ignore')
+            if not 200 <= response.status < 300:
+                return f"{Colors.RED}Error: HTTP {response.status}: {body.strip()}{Colors.RESET}"
+            return body
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            del _http_connections[host, port]
+            conn = None
+            if not retry or isinstance(e, TimeoutError):
+                return f"{Colors.RED}Error: {str(e)}{Colors.RESET}"
+
+def questdb_query(sql, **params):
+    """Run a SQL query through QuestDB's HTTP API and return the JSON text
+
+    Extra keyword arguments are passed on as /exec parameters, e.g.
+    nm="true" to leave the column metadata out of the response.
+    """
+    return http_fetch("localhost", 9000, "/exec", {"query": sql, **params},
+                      timeout=QUESTDB_QUERY_TIMEOUT)
+
+def read_cmdline(pid):
+    """Command line of pid with NULs turned into spaces, or None if it is gone"""
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            cmdline = f.read()
+    except OSError:
+        return None
+    return cmdline.replace(b'\0', b' ').decode('utf-8', 'ignore').strip()
+
+# Last PID found for each pattern, rechecked before falling back to a scan
+_pid_cache = {}
+
+def scan_processes(patterns):
+    """Map each regex pattern to the PID of a process whose command line matches it
+
+    A PID found on an earlier call is kept while its command line still
+    matches. Any other pattern is resolved to the lowest matching PID with one
+    pass over /proc, where `pgrep -f` would fork and walk /proc per pattern.
+    """
+    found = {}
+    missing = []
+    for pattern in patterns:
+        pid = _pid_cache.get(pattern)
+        if pid is not None:
+            cmdline = read_cmdline(pid)
+            if cmdline is not None and re.search(pattern, cmdline):
+                found[pattern] = pid
+                continue
+        found[pattern] = None
+        missing.append((pattern, re.compile(pattern)))
+    
+    if missing:
+        own_pid = os.getpid()
+        pids = sorted(int(entry) for entry in os.listdir('/proc') if entry.isdigit())
+        for pid in pids:
+            if pid == own_pid:
+                continue
+            cmdline = read_cmdline(pid)
+            if cmdline is None:
+                continue
+            for pattern, regex in missing:
+                if found[pattern] is None and regex.search(cmdline):
+                    found[pattern] = pid
+    
+    for pattern, _ in missing:
+        _pid_cache[pattern] = found[pattern]
+    return found
+
+async def http_get(host, port, path, timeout=0.5):
+    """Fetch path over plain HTTP and return the response, or "" on failure"""
+    async def fetch():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(f"GET {path} HTTP/1.0\r\nHost: {host}\r\n\r\n".encode())
+            await writer.drain()
+            return await reader.read()
+        finally:
+            writer.close()
+    
+    try:
+        data = await asyncio.wait_for(fetch(), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return ""
+    return data.decode('utf-8', 'ignore')
+
+@contextmanager
+def cbreak_input():
+    """Deliver keys without waiting for Enter, restoring the terminal after"""
+    fd = sys.stdin.fileno()
+    if not os.isatty(fd):
+        yield
+        return
+    saved = termios.tcgetattr(fd)
+    tty.setcbreak(fd)
+    try:
+        yield
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+async def wait_for_quit_key(timeout):
+    """Wait up to timeout seconds; True as soon as Q or ESC is pressed"""
+    loop = asyncio.get_running_loop()
+    fd = sys.stdin.fileno()
+    pressed = loop.create_future()
+    
+    def on_input():
+        keys = os.read(fd, 1024)
+        # End of input counts as quit, or we would spin on it
+        if not keys or any(key in keys for key in (b'q', b'Q', b'\x1b')):
+            if not pressed.done():
+                pressed.set_result(True)
+    
+    try:
+        loop.add_reader(fd, on_input)
+    except PermissionError:
+        # stdin is a regular file, which the event loop cannot watch
+        await asyncio.sleep(timeout)
+        return False
+    try:
+        return await asyncio.wait_for(pressed, timeout)
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        loop.remove_reader(fd)
+
+def draw_monitor_chrome(width, services):
+    """Draw the static parts of the monitor screen"""
+    clear_screen()
+    print(Colors.GREEN + rule("═", width) + Colors.RESET)
+    print(center_text(f"{Colors.BOLD}{Colors.GREEN}SYSTEM MONITOR{Colors.RESET}", width + 20))
+    print(Colors.GREEN + rule("═", width) + Colors.RESET)
+    
+    # Time
+    print(f"\n{Colors.YELLOW}Timestamp:{Colors.RESET}")
+    print(f"{Colors.CYAN}Press Q or Ctrl+C to return to menu{Colors.RESET}")
+    print(Colors.DIM + rule("─", width) + Colors.RESET)
+    
+    # Service status
+    print(f"\n{Colors.BOLD}{Colors.CYAN}SERVICE STATUS:{Colors.RESET}")
+    print("\n" * (len(services) - 1))
+    
+    # API Health
+    print(f"\n{Colors.BOLD}{Colors.CYAN}API STATUS:{Colors.RESET}")
+    print()
+    
+    print(Colors.DIM + rule("─", width) + Colors.RESET)
+    print("Refreshing every 5 seconds...")
+
+# Cache key -> (monotonic time fetched, output) for cached_fetch
+_fetch_cache = {}
+
+def cached_fetch(key, fetch, ttl, stale_ok=False):
+    """Call fetch(), reusing a successful result under key for ttl seconds
+
+    With stale_ok, a failed refresh returns the last good result, marked as
+    stale and followed by the error.
+    """
+    now = time.monotonic()
+    cached = _fetch_cache.get(key)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+    result = fetch()
+    if result.strip() and not result.startswith(f"{Colors.RED}Error"):
+        _fetch_cache[key] = (now, result)
+    elif stale_ok and cached:
+        age = int(now - cached[0])
+        return (f"{cached[1]}\n{Colors.YELLOW}(cached {age}s ago, refresh failed){Colors.RESET}\n"
+                f"{result}")
+    return result
+
 def monitor_mode():
     """Simple monitoring display"""
-    while True:
-        clear_screen()
-        width, height = get_terminal_size()
-        
-        # Monitor header
-        print(Colors.GREEN + "═" * width + Colors.RESET)
-        print(center_text(f"{Colors.BOLD}{Colors.GREEN}SYSTEM MONITOR{Colors.RESET}", width + 20))
-        print(Colors.GREEN + "═" * width + Colors.RESET)
-        
-        # Time
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"\n{Colors.YELLOW}Timestamp:{Colors.RESET} {current_time}")
-        print(f"{Colors.CYAN}Press Ctrl+C to return to menu{Colors.RESET}")
-        print(Colors.DIM + "─" * width + Colors.RESET)
-        
-        # Service status
-        print(f"\n{Colors.BOLD}{Colors.CYAN}SERVICE STATUS:{Colors.RESET}")
+    try:
+        asyncio.run(run_monitor())
+    except KeyboardInterrupt:
+        pass
+
+async def run_monitor():
+    """Monitor refresh loop; probes for each tick run concurrently"""
+    services = [
+        ("QuestDB", "questdb.*ServerMain", "9000"),
+        ("Go API", ".sptrader-api.", "8000"),
+        ("Oanda Feed", "oanda_feed.py", "N/A"),
+        ("OHLC Manager", "ohlc_manager.py", "N/A")
+    ]
+    # Screen rows of the fields that change between ticks
+    timestamp_row = 5
+    service_row = 10
+    api_row = service_row + len(services) + 2
+    
+    # Last text written at each (x, y); only cells that differ from the
+    # previous tick are rewritten
+    last_cells = {}
+    drawn_size = None
+    patterns = [pattern for _, pattern, _ in services]
+    with cbreak_input():
+        while True:
+            size = get_terminal_size()
+            if size != drawn_size:
+                draw_monitor_chrome(size[0], services)
+                drawn_size = size
+                last_cells.clear()
         
-        services = [
-            ("QuestDB", "pgrep -f 'questdb.*ServerMain'", "9000"),
-            ("Go API", "pgrep -f .sptrader-api.", "8000"),
-            ("Oanda Feed", "pgrep -f 'oanda_feed.py'", "N/A"),
-            ("OHLC Manager", "pgrep -f 'ohlc_manager.py'", "N/A")
-        ]
+            cells = {(12, timestamp_row): cached_time()}
         
-        for name, cmd, port in services:
-            pid = run_command(cmd).strip()
-            if pid and not pid.startswith("Error"):
-                status = f"{Colors.GREEN}● ONLINE{Colors.RESET}"
-                pid_info = f"PID: {pid.split()[0]}" if pid else ""
-            else:
-                status = f"{Colors.RED}○ OFFLINE{Colors.RESET}"
-                pid_info = ""
+            # Both probes run concurrently; the tick waits for the slower one
+            pids, health = await asyncio.gather(
+                asyncio.to_thread(scan_processes, patterns),
+                http_get("localhost", 8080, "/api/v1/health"))
+            for row, (name, pattern, port) in enumerate(services, start=service_row):
+                pid = pids[pattern]
+                if pid is not None:
+                    status = f"{Colors.GREEN}● ONLINE{Colors.RESET}"
+                    pid_info = f"PID: {pid}"
+                else:
+                    status = f"{Colors.RED}○ OFFLINE{Colors.RESET}"
+                    pid_info = ""
             
-            print(f"  {name:<15} {status:<20} {pid_info:<15} PORT: {port}")
+                cells[1, row] = f"  {name:<15} {status:<20} {pid_info:<15} PORT: {port}"
         
-        # API Health
-        print(f"\n{Colors.BOLD}{Colors.CYAN}API STATUS:{Colors.RESET}")
-        health = run_command("curl -s http://localhost:8080/api/v1/health 2>/dev/null")
-        if "healthy" in health.lower():
-            api_status = f"{Colors.GREEN}● API OPERATIONAL{Colors.RESET}"
-        else:
-            api_status = f"{Colors.RED}○ API UNREACHABLE{Colors.RESET}"
-        print(f"  {api_status}")
+            if "healthy" in health.lower():
+                api_status = f"{Colors.GREEN}● API OPERATIONAL{Colors.RESET}"
+            else:
+                api_status = f"{Colors.RED}○ API UNREACHABLE{Colors.RESET}"
+            cells[1, api_row] = f"  {api_status}"
         
-        print(Colors.DIM + "─" * width + Colors.RESET)
-        print("Refreshing every 5 seconds...")
+            buf = AnsiBuffer()
+            for (x, y), text in cells.items():
+                if last_cells.get((x, y)) != text:
+                    buf.move(x, y)
+                    buf.append(text)
+                    # Clear to end of line in case the new text is shorter
+                    buf.csi("K")
+                    last_cells[x, y] = text
+            buf.move(1, api_row + 3)
+            buf.flush()
         
+            if await wait_for_quit_key(5):
+                break
+
+def show_banner(title, color, width):
+    """Print a full-width command banner"""
+    print(color + rule("═", width) + Colors.RESET)
+    print(center_text(f"{Colors.BOLD}{color}{title}{Colors.RESET}", width + 20))
+    print(color + rule("═", width) + Colors.RESET)
+    print()
+
+def tail_lines(path, count, block_size=8192):
+    """Last count lines of a file, read backwards from the end in blocks"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    return data.decode('utf-8', 'replace').splitlines()[-count:]
+
+def show_logs():
+    print(f"{Colors.CYAN}Recent log entries:{Colors.RESET}")
+    # Same as `tail -20 logs/runtime/*.log | grep -v "^$" | tail -20`,
+    # without the three processes
+    paths = sorted(glob.glob('logs/runtime/*.log'))
+    lines = []
+    for path in paths:
+        if len(paths) > 1:
+            lines.append(f"==> {path} <==")
         try:
-            time.sleep(5)
-        except KeyboardInterrupt:
-            break
+            lines.extend(tail_lines(path, 20))
+        except OSError as e:
+            print(f"{Colors.RED}Error: {e}{Colors.RESET}")
+    print("\n".join([line for line in lines if line][-20:]))
+
+def api_health():
+    """Fetch the API health report, pretty-printed"""
+    body = http_fetch("localhost", 8080, "/api/v1/health")
+    if body.startswith(f"{Colors.RED}Error"):
+        return body
+    try:
+        return json.dumps(json.loads(body), indent=4) + "\n"
+    except ValueError as e:
+        return f"{Colors.RED}Error: {str(e)}{Colors.RESET}"
+
+def show_api_health():
+    result = cached_fetch("api_health", api_health, ttl=5)
+    print(result)
+
+def show_database_stats():
+    # The row count moves on the order of minutes; if QuestDB is briefly
+    # unreachable, show the last count we got, flagged as stale, with the error
+    sql = "SELECT count(*) FROM ohlc_5m_v2"
+    result = cached_fetch(sql, lambda: questdb_query(sql), ttl=30, stale_ok=True)
+    print(f"{Colors.CYAN}Query Result:{Colors.RESET}")
+    print(result)
+
+# Menu choice -> (banner title, banner color, action). Choices without a
+# banner title draw their own screen.
+COMMANDS = {
+    '1': ("STARTING SERVICES", Colors.GREEN, lambda: run_sptrader('start')),
+    '2': ("STOPPING SERVICES", Colors.RED, lambda: run_sptrader('stop')),
+    '3': ("RESTARTING SERVICES", Colors.YELLOW, lambda: run_sptrader('restart')),
+    '4': ("SYSTEM STATUS", Colors.BLUE, lambda: run_sptrader('status')),
+    '5': ("SYSTEM LOGS", Colors.MAGENTA, show_logs),
+    '6': ("API HEALTH CHECK", Colors.CYAN, show_api_health),
+    '7': ("DATABASE STATISTICS", Colors.GREEN, show_database_stats),
+    '8': (None, None, lambda: load_historical_data()),
+    '9': ("DATA GAP ANALYSIS", Colors.PURPLE, lambda: run_sptrader('db', 'gaps', '--fill')),
+}
 
 def execute_command(choice):
     """Execute commands"""
     clear_screen()
     width, _ = get_terminal_size()
     
-    if choice == '1':
-        print(Colors.GREEN + "═" * width + Colors.RESET)
-        print(center_text(f"{Colors.BOLD}{Colors.GREEN}STARTING SERVICES{Colors.RESET}", width + 20))
-        print(Colors.GREEN + "═" * width + Colors.RESET)
-        print()
-        os.system('./sptrader start')
-        
-    elif choice == '2':
-        print(Colors.RED + "═" * width + Colors.RESET)
-        print(center_text(f"{Colors.BOLD}{Colors.RED}STOPPING SERVICES{Colors.RESET}", width + 20))
-        print(Colors.RED + "═" * width + Colors.RESET)
-        print()
-        os.system('./sptrader stop')
-        
-    elif choice == '3':
-        print(Colors.YELLOW + "═" * width + Colors.RESET)
-        print(center_text(f"{Colors.BOLD}{Colors.YELLOW}RESTARTING SERVICES{Colors.RESET}", width + 20))
-        print(Colors.YELLOW + "═" * width + Colors.RESET)
-        print()
-        os.system('./sptrader restart')
-        
-    elif choice == '4':
-        print(Colors.BLUE + "═" * width + Colors.RESET)
-        print(center_text(f"{Colors.BOLD}{Colors.BLUE}SYSTEM STATUS{Colors.RESET}", width + 20))
-        print(Colors.BLUE + "═" * width + Colors.RESET)
-        print()
-        os.system('./sptrader status')
-        
-    elif choice == '5':
-        print(Colors.MAGENTA + "═" * width + Colors.RESET)
-        print(center_text(f"{Colors.BOLD}{Colors.MAGENTA}SYSTEM LOGS{Colors.RESET}", width + 20))
-        print(Colors.MAGENTA + "═" * width + Colors.RESET)
-        print()
-        print(f"{Colors.CYAN}Recent log entries:{Colors.RESET}")
-        os.system('tail -20 logs/runtime/*.log | grep -v "^$" | tail -20')
-        
-    elif choice == '6':
-        print(Colors.CYAN + "═" * width + Colors.RESET)
-        print(center_text(f"{Colors.BOLD}{Colors.CYAN}API HEALTH CHECK{Colors.RESET}", width + 20))
-        print(Colors.CYAN + "═" * width + Colors.RESET)
-        print()
-        result = run_command("curl -s http://localhost:8080/api/v1/health | python3 -m json.tool")
-        print(result)
-        
-    elif choice == '7':
-        print(Colors.GREEN + "═" * width + Colors.RESET)
-        print(center_text(f"{Colors.BOLD}{Colors.GREEN}DATABASE STATISTICS{Colors.RESET}", width + 20))
-        print(Colors.GREEN + "═" * width + Colors.RESET)
-        print()
-        result = run_command('curl -s -G "http://localhost:9000/exec" --data-urlencode "query=SELECT count(*) FROM ohlc_5m_v2" 2>/dev/null')
-        print(f"{Colors.CYAN}Query Result:{Colors.RESET}")
-        print(result)
-    
-    elif choice == '8':
-        load_historical_data()
-    
-    elif choice == '9':
-        print(Colors.PURPLE + "═" * width + Colors.RESET)
-        print(center_text(f"{Colors.BOLD}{Colors.PURPLE}DATA GAP ANALYSIS{Colors.RESET}", width + 20))
-        print(Colors.PURPLE + "═" * width + Colors.RESET)
-        print()
-        os.system('./sptrader db gaps --fill')
+    command = COMMANDS.get(choice)
+    if command:
+        title, color, action = command
+        if title:
+            show_banner(title, color, width)
+        action()
     
     print()
-    print(Colors.DIM + "─" * width + Colors.RESET)
+    print(Colors.DIM + rule("─", width) + Colors.RESET)
     input(f"{Colors.YELLOW}Press ENTER to return to menu...{Colors.RESET}")
 
 def load_historical_data():
@@ -246,16 +671,17 @@ def load_historical_data():
     clear_screen()
     width, _ = get_terminal_size()
     
-    print(Colors.BLUE + "═" * width + Colors.RESET)
+    print(Colors.BLUE + rule("═", width) + Colors.RESET)
     print(center_text(f"{Colors.BOLD}{Colors.BLUE}HISTORICAL DATA LOADER{Colors.RESET}", width + 20))
-    print(Colors.BLUE + "═" * width + Colors.RESET)
+    print(Colors.BLUE + rule("═", width) + Colors.RESET)
     print()
     
     # First, check what data we already have
     print(f"{Colors.CYAN}Checking existing data...{Colors.RESET}")
-    query_result = run_command("""
-        curl -s -G "http://localhost:9000/exec" --data-urlencode "query=SELECT symbol, min(timestamp) as first_tick, max(timestamp) as last_tick, count(*) as tick_count FROM market_data_v2 GROUP BY symbol" 2>/dev/null
-    """)
+    # Sorted by symbol name for consistent ordering; only the rows are
+    # used, so skip the column metadata
+    sql = "SELECT symbol, min(timestamp) as first_tick, max(timestamp) as last_tick, count(*) as tick_count FROM market_data_v2 GROUP BY symbol ORDER BY symbol"
+    query_result = cached_fetch(sql, lambda: questdb_query(sql, nm="true"), ttl=15)
     
     existing_symbols = {}
     try:
@@ -266,9 +692,7 @@ def load_historical_data():
             print("     " + "-" * 65)
             
             letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-            # Sort by symbol name for consistent ordering
-            sorted_data = sorted(data["dataset"], key=lambda x: x[0])
-            for idx, row in enumerate(sorted_data):
+            for idx, row in enumerate(data["dataset"]):
                 letter = letters[idx] if idx < len(letters) else str(idx)
                 symbol = row[0]
                 existing_symbols[letter] = {
@@ -277,12 +701,13 @@ def load_historical_data():
                     'last': row[2],
                     'count': row[3]
                 }
-                first = datetime.fromisoformat(row[1].replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M')
-                last = datetime.fromisoformat(row[2].replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M')
+                first = _fmt_iso(row[1])
+                last = _fmt_iso(row[2])
                 count = f"{row[3]:,}"
                 print(f"{Colors.CYAN}[{letter}]{Colors.RESET}  {symbol:<10} {first:<20} {last:<20} {count:>15}")
     except:
         print(f"{Colors.YELLOW}No existing data found or couldn't parse response{Colors.RESET}")
+    by_symbol = {info['symbol']: info for info in existing_symbols.values()}
     
     print(f"\n{Colors.CYAN}Select loading option:{Colors.RESET}")
     print(f"  {Colors.GREEN}[1]{Colors.RESET} Fill from last date to today")
@@ -338,13 +763,13 @@ def load_historical_data():
         latest_dates = []
         for symbol in symbols:
             # Check if we have existing data for this symbol
-            for letter, info in existing_symbols.items():
-                if info['symbol'] == symbol:
-                    try:
-                        last_date = datetime.fromisoformat(info['last'].replace('Z', '+00:00'))
-                        latest_dates.append(last_date)
-                    except:
-                        pass
+            info = by_symbol.get(symbol)
+            if info:
+                try:
+                    last_date = _parse_iso(info['last'])
+                    latest_dates.append(last_date)
+                except:
+                    pass
         
         if latest_dates:
             # Start from the earliest "last date" + 1 day
@@ -359,13 +784,13 @@ def load_historical_data():
         first_dates = []
         for symbol in symbols:
             # Check if we have existing data for this symbol
-            for letter, info in existing_symbols.items():
-                if info['symbol'] == symbol:
-                    try:
-                        first_date = datetime.fromisoformat(info['first'].replace('Z', '+00:00'))
-                        first_dates.append(first_date)
-                    except:
-                        pass
+            info = by_symbol.get(symbol)
+            if info:
+                try:
+                    first_date = _parse_iso(info['first'])
+                    first_dates.append(first_date)
+                except:
+                    pass
         
         if first_dates:
             # End one day before the latest "first date"
@@ -412,49 +837,117 @@ def load_historical_data():
         print(f"{Colors.RED}Cancelled{Colors.RESET}")
         return
     
-    # Load data for each symbol
+    # Load data for each symbol - one loader process per symbol, run side
+    # by side; their output is streamed line by line as it arrives, each
+    # line prefixed with its symbol so the interleaved runs stay readable
     print(f"\n{Colors.GREEN}Loading data...{Colors.RESET}")
-    os.chdir(os.path.expanduser("~/SPtrader/data_feeds"))
-    
-    for symbol in symbols:
-        print(f"\n{Colors.CYAN}Loading {symbol}...{Colors.RESET}")
-        cmd = f"python3 dukascopy_to_ilp.py {symbol} {start_date.strftime('%Y-%m-%d')} {end_date.strftime('%Y-%m-%d')}"
-        result = os.system(cmd)
-        if result == 0:
-            print(f"{Colors.GREEN}✓ {symbol} loaded successfully{Colors.RESET}")
+    sys.stdout.flush()
+    data_feeds = os.path.expanduser("~/SPtrader/data_feeds")
+    start_str = start_date.strftime('%Y-%m-%d')
+    end_str = end_date.strftime('%Y-%m-%d')
+    # Unbuffered, so the loaders' progress is not held back by the pipe
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    print_lock = threading.Lock()
+    # Running loader per symbol, so an interrupted load can stop them
+    processes = {}
+    
+    def show(symbol, text):
+        with print_lock:
+            print(f"{Colors.CYAN}[{symbol}]{Colors.RESET} {text}")
+            sys.stdout.flush()
+    
+    def load_symbol(symbol):
+        show(symbol, f"{Colors.CYAN}Loading {symbol}...{Colors.RESET}")
+        try:
+            with subprocess.Popen(
+                ["python3", "dukascopy_to_ilp.py", symbol, start_str, end_str],
+                cwd=data_feeds, env=env, stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT, text=True
+            ) as process:
+                processes[symbol] = process
+                for line in process.stdout:
+                    show(symbol, line.rstrip("\n"))
+            loaded = process.returncode == 0
+        except OSError as e:
+            show(symbol, f"{Colors.RED}Error: {str(e)}{Colors.RESET}")
+            loaded = False
+        if loaded:
+            show(symbol, f"{Colors.GREEN}✓ {symbol} loaded successfully{Colors.RESET}")
         else:
-            print(f"{Colors.RED}✗ {symbol} failed to load{Colors.RESET}")
+            show(symbol, f"{Colors.RED}✗ {symbol} failed to load{Colors.RESET}")
+    
+    executor = ThreadPoolExecutor(max_workers=min(len(symbols), os.cpu_count() or 1))
+    futures = {symbol: executor.submit(load_symbol, symbol) for symbol in symbols}
+    try:
+        for future in futures.values():
+            future.result()
+    except KeyboardInterrupt:
+        # Ctrl+C aborts the load, not the control center: skip the symbols
+        # not started yet, stop the running loaders and wait for them
+        previous_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+        try:
+            interrupted = [symbol for symbol, future in futures.items() if not future.done()]
+            for future in futures.values():
+                future.cancel()
+            for process in list(processes.values()):
+                if process.poll() is None:
+                    process.terminate()
+            executor.shutdown(wait=True)
+        finally:
+            signal.signal(signal.SIGINT, previous_handler)
+        print(f"\n{Colors.YELLOW}Data loading interrupted: {', '.join(interrupted)} not completed{Colors.RESET}")
+        return
+    executor.shutdown()
     
     print(f"\n{Colors.GREEN}Data loading complete!{Colors.RESET}")
-    os.chdir(os.path.expanduser("~/SPtrader"))
 
 def main():
     """Main loop"""
     SPTRADER_HOME = os.path.expanduser("~/SPtrader")
     os.chdir(SPTRADER_HOME)
     
-    while True:
-        clear_screen()
-        show_header()
-        show_menu()
+    # Buffer terminal output in 64 KB blocks and flush at frame boundaries
+    # instead of after every escape sequence
+    original_stdout = sys.stdout
+    sys.stdout = io.TextIOWrapper(io.BufferedWriter(original_stdout.buffer, 65536),
+                                  encoding=original_stdout.encoding,
+                                  write_through=False)
+    try:
+        # The menu is only repainted after something replaced it on screen
+        need_full_redraw = True
+        drawn_size = None
+        while True:
+            size = get_terminal_size()
+            if need_full_redraw or size != drawn_size:
+                clear_screen()
+                show_header()
+                show_menu()
+                need_full_redraw = False
+                drawn_size = size
         
-        # Input prompt
-        width, height = get_terminal_size()
-        print_at(1, height-1, f"{Colors.GREEN}sptrader>{Colors.RESET} ")
+            # Input prompt
+            width, height = size
+            print_at(1, height-1, f"{Colors.GREEN}sptrader>{Colors.RESET} \033[K")
         
-        choice = input().strip().upper()
+            choice = input().strip().upper()
         
-        if choice == 'M':
-            monitor_mode()
-        elif choice == 'Q':
-            clear_screen()
-            print(f"\n{Colors.GREEN}Goodbye!{Colors.RESET}\n")
-            sys.exit(0)
-        elif choice in ['1', '2', '3', '4', '5', '6', '7', '8']:
-            execute_command(choice)
-        else:
-            print(f"\n{Colors.RED}Invalid input. Try again.{Colors.RESET}")
-            time.sleep(1)
+            if choice == 'M':
+                monitor_mode()
+                need_full_redraw = True
+            elif choice == 'Q':
+                clear_screen()
+                print(f"\n{Colors.GREEN}Goodbye!{Colors.RESET}\n")
+                sys.exit(0)
+            elif choice in ['1', '2', '3', '4', '5', '6', '7', '8']:
+                execute_command(choice)
+                need_full_redraw = True
+            else:
+                # Leave the menu up and just report it under the prompt
+                print_at(1, height, f"{Colors.RED}Invalid input. Try again.{Colors.RESET}\033[K")
+    finally:
+        # Detach so the real stdout buffer stays open after we restore it
+        sys.stdout.detach().detach()
+        sys.stdout = original_stdout
 
 if __name__ == "__main__":
     try:
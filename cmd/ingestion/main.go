@@ -1,13 +1,16 @@
 package main
 
 import (
+	"bufio"
 	"context"
 	"encoding/json"
 	"flag"
 	"fmt"
+	"io"
 	"log"
 	"net/http"
 	"os"
+	"strings"
 	"time"
 
 	qdb "github.com/questdb/go-questdb-client/v3"
@@ -36,6 +39,7 @@ func main() {
 		httpAddr   = flag.String("http", "localhost:9000", "QuestDB HTTP address")
 		jsonFile   = flag.String("file", "", "JSON file with tick data to import")
 		pythonMode = flag.Bool("python", false, "Accept data from Python script via stdin")
+		streamMode = flag.Bool("stream", false, "Accept newline-delimited JSON tick batches via stdin until EOF")
 		testMode   = flag.Bool("test", false, "Generate and insert test data")
 	)
 	flag.Parse()
@@ -66,8 +70,12 @@ func main() {
 		if err := importFromStdin(ctx, sender); err != nil {
 			log.Fatalf("Failed to import from stdin: %v", err)
 		}
+	} else if *streamMode {
+		if err := importStream(ctx, sender, os.Stdin, os.Stdout); err != nil {
+			log.Fatalf("Failed to import stream: %v", err)
+		}
 	} else {
-		log.Fatal("Please specify -test, -file, or -python mode")
+		log.Fatal("Please specify -test, -file, -python, or -stream mode")
 	}
 
 	// Verify data was inserted
@@ -163,6 +171,53 @@ func importFromStdin(ctx context.Context, sender qdb.LineSender) error {
 	return insertTicks(ctx, sender, ticks)
 }
 
+// importStream keeps reading batches until stdin is closed, so one process
+// serves a whole Python loader run. Each batch is one JSON tick per line,
+// ended by an empty line, and is acknowledged on out with a line of
+// "OK <count>" or "ERR <message>".
+func importStream(ctx context.Context, sender qdb.LineSender, in io.Reader, out io.Writer) error {
+	log.Println("Streaming tick batches from stdin...")
+	
+	scanner := bufio.NewScanner(in)
+	scanner.Buffer(make([]byte, 64*1024), 1024*1024)
+	
+	var ticks []Tick
+	var batchErr error
+	for scanner.Scan() {
+		line := scanner.Bytes()
+		if len(line) == 0 {
+			// End of batch
+			err := batchErr
+			if err == nil {
+				err = insertTicks(ctx, sender, ticks)
+			}
+			if err != nil {
+				fmt.Fprintf(out, "ERR %s\n", strings.ReplaceAll(err.Error(), "\n", " "))
+			} else {
+				fmt.Fprintf(out, "OK %d\n", len(ticks))
+			}
+			ticks = ticks[:0]
+			batchErr = nil
+			continue
+		}
+		
+		// After a bad line the rest of the batch is only drained
+		if batchErr != nil {
+			continue
+		}
+		var tick Tick
+		if err := json.Unmarshal(line, &tick); err != nil {
+			batchErr = fmt.Errorf("failed to parse tick %d: %w", len(ticks), err)
+			continue
+		}
+		ticks = append(ticks, tick)
+	}
+	if err := scanner.Err(); err != nil {
+		return fmt.Errorf("failed to read batch: %w", err)
+	}
+	return nil
+}
+
 func insertTicks(ctx context.Context, sender qdb.LineSender, ticks []Tick) error {
 	log.Printf("Inserting %d ticks via ILP...", len(ticks))
 	
@@ -0,0 +1,160 @@
+package main
+
+import (
+	"bufio"
+	"context"
+	"errors"
+	"io"
+	"strings"
+	"testing"
+	"time"
+
+	qdb "github.com/questdb/go-questdb-client/v3"
+)
+
+// fakeSender records what insertTicks sends instead of writing ILP. Only
+// the methods insertTicks calls are implemented; the embedded interface
+// stands in for the rest of qdb.LineSender.
+type fakeSender struct {
+	qdb.LineSender
+	symbols  []string
+	times    []time.Time
+	flushes  int
+	flushErr error
+}
+
+func (s *fakeSender) Table(name string) qdb.LineSender { return s }
+
+func (s *fakeSender) Symbol(name, val string) qdb.LineSender {
+	s.symbols = append(s.symbols, val)
+	return s
+}
+
+func (s *fakeSender) Float64Column(name string, val float64) qdb.LineSender { return s }
+
+func (s *fakeSender) Int64Column(name string, val int64) qdb.LineSender { return s }
+
+func (s *fakeSender) StringColumn(name, val string) qdb.LineSender { return s }
+
+func (s *fakeSender) BoolColumn(name string, val bool) qdb.LineSender { return s }
+
+func (s *fakeSender) At(ctx context.Context, ts time.Time) error {
+	s.times = append(s.times, ts)
+	return nil
+}
+
+func (s *fakeSender) Flush(ctx context.Context) error {
+	s.flushes++
+	return s.flushErr
+}
+
+// tickLine is a tick as the Python loader writes it (pandas to_json, one
+// record per line)
+func tickLine(symbol, timestamp string) string {
+	return `{"timestamp":"` + timestamp + `","symbol":"` + symbol + `",` +
+		`"bid":1.0945,"ask":1.09452,"price":1.09451,"spread":0.00002,` +
+		`"volume":2.5,"bid_volume":1.25,"ask_volume":1.25,"hour_of_day":10,` +
+		`"day_of_week":2,"trading_session":"London","market_open":true}` + "\n"
+}
+
+func TestImportStreamAcksEachBatch(t *testing.T) {
+	sender := &fakeSender{}
+	in := tickLine("EURUSD", "2024-01-02T10:00:00.123000+00:00") +
+		tickLine("EURUSD", "2024-01-02T10:00:01+00:00") + "\n" +
+		tickLine("GBPUSD", "2024-01-02T11:00:00+00:00") + "\n"
+	var out strings.Builder
+
+	if err := importStream(context.Background(), sender, strings.NewReader(in), &out); err != nil {
+		t.Fatalf("importStream: %v", err)
+	}
+
+	if got, want := out.String(), "OK 2\nOK 1\n"; got != want {
+		t.Errorf("acks = %q, want %q", got, want)
+	}
+	if got := strings.Join(sender.symbols, ","); got != "EURUSD,EURUSD,GBPUSD" {
+		t.Errorf("symbols sent = %s", got)
+	}
+	want := time.Date(2024, 1, 2, 10, 0, 0, 123000000, time.UTC)
+	if len(sender.times) != 3 || !sender.times[0].Equal(want) {
+		t.Errorf("timestamps sent = %v, want first %v", sender.times, want)
+	}
+	if sender.flushes != 2 {
+		t.Errorf("flushes = %d, want one per batch", sender.flushes)
+	}
+}
+
+func TestImportStreamRejectsBadBatch(t *testing.T) {
+	sender := &fakeSender{}
+	in := tickLine("EURUSD", "2024-01-02T10:00:00+00:00") + "{not json\n" +
+		tickLine("EURUSD", "2024-01-02T10:00:02+00:00") + "\n" +
+		tickLine("EURUSD", "2024-01-02T10:00:03+00:00") + "\n"
+	var out strings.Builder
+
+	if err := importStream(context.Background(), sender, strings.NewReader(in), &out); err != nil {
+		t.Fatalf("importStream: %v", err)
+	}
+
+	acks := strings.Split(strings.TrimSuffix(out.String(), "\n"), "\n")
+	if len(acks) != 2 || !strings.HasPrefix(acks[0], "ERR failed to parse tick 1:") || acks[1] != "OK 1" {
+		t.Errorf("acks = %q, want an ERR for the bad batch then OK 1", acks)
+	}
+	// Nothing from the bad batch is sent
+	if len(sender.times) != 1 {
+		t.Errorf("ticks sent = %d, want only the good batch's 1", len(sender.times))
+	}
+}
+
+func TestImportStreamReportsSendError(t *testing.T) {
+	sender := &fakeSender{flushErr: errors.New("connection reset\nby peer")}
+	in := tickLine("EURUSD", "2024-01-02T10:00:00+00:00") + "\n"
+	var out strings.Builder
+
+	if err := importStream(context.Background(), sender, strings.NewReader(in), &out); err != nil {
+		t.Fatalf("importStream: %v", err)
+	}
+
+	// The ack stays on one line
+	if got, want := out.String(), "ERR failed to final flush: connection reset by peer\n"; got != want {
+		t.Errorf("acks = %q, want %q", got, want)
+	}
+}
+
+// The Python loader writes a batch and blocks on its ack before sending the
+// next, so each ack has to arrive while stdin is still open
+func TestImportStreamAckRoundTrip(t *testing.T) {
+	sender := &fakeSender{}
+	inReader, inWriter := io.Pipe()
+	outReader, outWriter := io.Pipe()
+	done := make(chan error, 1)
+	go func() {
+		done <- importStream(context.Background(), sender, inReader, outWriter)
+		outWriter.Close()
+	}()
+
+	acks := bufio.NewReader(outReader)
+	for i, batch := range []string{
+		tickLine("EURUSD", "2024-01-02T10:00:00+00:00") + tickLine("EURUSD", "2024-01-02T10:00:01+00:00"),
+		tickLine("EURUSD", "2024-01-02T11:00:00+00:00"),
+	} {
+		if _, err := io.WriteString(inWriter, batch+"\n"); err != nil {
+			t.Fatalf("batch %d: write: %v", i, err)
+		}
+		ack, err := acks.ReadString('\n')
+		if err != nil {
+			t.Fatalf("batch %d: read ack: %v", i, err)
+		}
+		if want := []string{"OK 2\n", "OK 1\n"}[i]; ack != want {
+			t.Errorf("batch %d: ack = %q, want %q", i, ack, want)
+		}
+	}
+
+	inWriter.Close()
+	select {
+	case err := <-done:
+		if err != nil {
+			t.Errorf("importStream: %v", err)
+		}
+	case <-time.After(5 * time.Second):
+		t.Fatal("importStream did not return after stdin closed")
+	}
+}
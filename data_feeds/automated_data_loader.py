@@ -5,17 +5,36 @@ Loads market data without starting additional services
 *Created: May 30, 2025*
 """
 
+import atexit
 import sys
 import json
 import subprocess
 import os
+import threading
+import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from dukascopy_importer import DukascopyDownloader
 
 # Configuration
 BATCH_DAYS = 1  # Process 1 day at a time
+DOWNLOAD_WORKERS = 8  # Parallel hourly downloads per batch
 STATE_FILE = "/home/millet_frazier/SPtrader/data_feeds/.auto_load_progress.json"
+INGESTION_BINARY = "/home/millet_frazier/SPtrader/build/ingestion"
 LOG_FILE = "/home/millet_frazier/SPtrader/logs/runtime/data_loader.log"
+QUESTDB_EXEC_URL = "http://localhost:9000/exec"
+INGESTION_LOG_LINES = 20  # Recent ingestion service log lines kept for failure reports
+
+# Kept-alive connection for QuestDB queries
+_questdb = requests.Session()
+
+# QuestDB timestamps end in 'Z', which fromisoformat accepts from 3.11 on
+if sys.version_info >= (3, 11):
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(value):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
 
 def log(message):
     """Log to file and console"""
@@ -38,92 +57,164 @@ def load_progress():
 
 def save_progress(progress):
     """Save progress to state file"""
-    with open(STATE_FILE, 'w') as f:
-        json.dump(progress, f, indent=2)
+    # Write a temp file and rename it into place, so a crash mid-write
+    # leaves the previous state intact
+    tmp_file = STATE_FILE + ".tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(progress, f, separators=(',', ':'))
+    os.replace(tmp_file, STATE_FILE)
+
+_downloader = None
+
+def get_downloader():
+    """Create the Dukascopy downloader on first use and reuse it for every batch"""
+    # One session for the whole run keeps its pooled HTTPS connections to
+    # Dukascopy open between batches instead of re-handshaking each day
+    global _downloader
+    if _downloader is None:
+        _downloader = DukascopyDownloader()
+    return _downloader
 
-def send_to_ilp(records, symbol):
-    """Send batch of records to ILP ingestion"""
-    if not records:
+_ingestion = None
+_ingestion_log = deque(maxlen=INGESTION_LOG_LINES)
+_ingestion_log_reader = None
+
+def collect_ingestion_log(stream):
+    """Keep the ingestion service's latest log lines, for failure reports"""
+    for line in stream:
+        _ingestion_log.append(line.decode(errors='replace').rstrip())
+
+def get_ingestion():
+    """Start the Go ingestion service on first use and keep it running"""
+    global _ingestion, _ingestion_log_reader
+    if _ingestion is None:
+        # Stream mode reads newline-delimited batches until stdin closes
+        # and acknowledges each one with an OK/ERR line. Its log goes to
+        # stderr, which is drained in the background and only logged when
+        # a batch fails
+        _ingestion = subprocess.Popen(
+            [INGESTION_BINARY, '-stream'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        _ingestion_log_reader = threading.Thread(
+            target=collect_ingestion_log, args=(_ingestion.stderr,), daemon=True
+        )
+        _ingestion_log_reader.start()
+        atexit.register(close_ingestion)
+    return _ingestion
+
+def close_ingestion():
+    """Close the ingestion service's input and wait for it to finish"""
+    global _ingestion
+    if _ingestion is not None:
+        try:
+            _ingestion.stdin.close()
+        except BrokenPipeError:
+            pass
+        _ingestion.wait()
+        _ingestion = None
+
+def send_to_ilp(ticks, symbol):
+    """Send batch of ticks (a process_hour_frame DataFrame) to ILP ingestion"""
+    if ticks.empty:
         return True
     
-    log(f"  📤 Sending {len(records)} ticks to ILP...")
-    
-    # Convert to JSON and pipe to Go ingestion service
-    json_data = json.dumps(records, default=str)
+    log(f"  📤 Sending {len(ticks)} ticks to ILP...")
     
-    # Run the Go ingestion service
-    process = subprocess.Popen(
-        ['/home/millet_frazier/SPtrader/build/ingestion', '-python'],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True
-    )
+    # One JSON record per line, encoded by pandas' C JSON writer straight
+    # from the columns; 15 digits round-trips the 5-decimal prices
+    payload = ticks.to_json(orient='records', lines=True, double_precision=15)
+    if not payload.endswith("\n"):
+        payload += "\n"
     
-    # Send data and get output
-    output, _ = process.communicate(input=json_data)
+    # Pipe to the Go ingestion service; an empty line ends the batch
+    ingestion = get_ingestion()
+    try:
+        ingestion.stdin.write(payload.encode())
+        ingestion.stdin.write(b"\n")
+        ingestion.stdin.flush()
+        reply = ingestion.stdout.readline().decode().strip()
+    except BrokenPipeError:
+        reply = ""
     
     # Check result
-    if process.returncode == 0:
-        log(f"  ✅ Successfully ingested {len(records)} ticks")
+    if reply.startswith("OK"):
+        log(f"  ✅ Successfully ingested {len(ticks)} ticks")
+        _ingestion_log.clear()
         return True
     else:
-        log(f"  ❌ Ingestion failed: {output}")
+        if not reply:
+            # The service exited; let the log reader catch its last lines
+            _ingestion_log_reader.join(timeout=5)
+        log(f"  ❌ Ingestion failed: {reply[4:] if reply else 'ingestion service exited'}")
+        for line in list(_ingestion_log):
+            log(f"     {line}")
+        _ingestion_log.clear()
         return False
 
 def process_batch(symbol, start_date, end_date):
     """Process a single batch of data"""
     log(f"🔄 Processing batch: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
     
-    # Initialize downloader
-    downloader = DukascopyDownloader()
-    
-    # Download data
-    log(f"  📥 Downloading...")
-    downloader.download_date_range([symbol], start_date, end_date)
+    downloader = get_downloader()
     
-    # Get the downloaded data by processing each hour
-    all_records = []
+    # Every (day, hour) in the batch, in chronological order
+    tasks = []
     current = start_date
     
     while current <= end_date:
         for hour in range(24):
             if current.replace(hour=hour) > end_date:
                 break
-                
-            # Download hour data
-            data = downloader.download_hour_data(symbol, current, hour)
-            if data:
-                # Process into records
-                records = downloader.process_hour_ticks(symbol, current, hour, data)
-                all_records.extend(records)
+            tasks.append((current, hour))
         
         # Move to next day
         current = current.replace(hour=0) + timedelta(days=1)
     
-    log(f"  ✅ Downloaded {len(all_records)} ticks")
+    # Download data - the hourly fetches are I/O bound, so run them side by
+    # side; map() hands the results back in task order, so each hour can be
+    # ingested as soon as it and everything before it has arrived
+    log(f"  📥 Downloading...")
+    total_ticks = 0
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        downloads = executor.map(
+            lambda task: downloader.download_hour_data(symbol, *task), tasks
+        )
+        for (day, hour), data in zip(tasks, downloads):
+            if not data:
+                continue
+            
+            # Process into ticks and hand them straight to ILP
+            ticks = downloader.process_hour_frame(symbol, day, hour, data)
+            if ticks.empty:
+                continue
+            
+            if not send_to_ilp(ticks, symbol):
+                # No point fetching the rest of a batch that will be retried
+                executor.shutdown(cancel_futures=True)
+                return False
+            total_ticks += len(ticks)
+            del ticks
     
-    # Send to ILP
-    if all_records:
-        return send_to_ilp(all_records, symbol)
+    if total_ticks:
+        log(f"  ✅ Downloaded {total_ticks} ticks")
     else:
         log("  ⚠️ No data to ingest")
-        return True
+    return True
 
-def get_latest_data_date(symbol):
-    """Get the latest date for which we have data for the given symbol"""
+def get_latest_data_date(symbol, since=None):
+    """Get the latest date for which we have data for the given symbol,
+    optionally looking only at data from the since date on"""
     try:
         # Check the database for the latest timestamp
-        query = f"SELECT%20MAX(timestamp)%20FROM%20market_data_v2%20WHERE%20symbol='{symbol}'"
-        url = f"http://localhost:9000/exec?query={query}"
-        
-        process = subprocess.run(
-            ["curl", "-s", url],
-            capture_output=True, 
-            text=True
-        )
+        query = f"SELECT MAX(timestamp) FROM market_data_v2 WHERE symbol='{symbol}'"
+        if since:
+            query += f" AND timestamp >= '{since}'"
+        response = _questdb.get(QUESTDB_EXEC_URL, params={"query": query}, timeout=5)
         
-        output = process.stdout
+        output = response.text
         
         # Parse JSON response
         try:
@@ -133,7 +224,7 @@ def get_latest_data_date(symbol):
                 latest_timestamp = response["dataset"][0][0]
                 if latest_timestamp:
                     # Convert to datetime
-                    dt = datetime.fromisoformat(latest_timestamp.replace('Z', '+00:00'))
+                    dt = _parse_iso(latest_timestamp)
                     # Return date only
                     return dt.date()
             
@@ -147,6 +238,21 @@ def get_latest_data_date(symbol):
         log(f"❌ Error querying database: {e}")
         return None
 
+def get_latest_loaded_date(symbol, symbol_progress):
+    """Get the latest date in the database for symbol, using the state file's
+    last date to narrow the search"""
+    # QuestDB is always the source of truth, since the state file can lag or
+    # lead what was ingested. The state file's date only lets the query
+    # start from that day's partition rather than scanning the whole table,
+    # and it falls back to the full scan when nothing is found from there on
+    last_date = symbol_progress.get('last_date')
+    latest_db_date = get_latest_data_date(symbol, since=last_date) if last_date else None
+    if not latest_db_date:
+        latest_db_date = get_latest_data_date(symbol)
+    if latest_db_date:
+        symbol_progress['last_date'] = latest_db_date.strftime('%Y-%m-%d')
+    return latest_db_date
+
 def main():
     """Main function"""
     # Ensure log directory exists
@@ -166,12 +272,14 @@ def main():
     progress = load_progress()
     symbol_progress = progress.get(symbol, {})
     
-    # Get last date from database
-    latest_db_date = get_latest_data_date(symbol)
+    # Get last loaded date from the database
+    latest_date = get_latest_loaded_date(symbol, symbol_progress)
+    progress[symbol] = symbol_progress
+    save_progress(progress)
     
-    if latest_db_date:
-        # Start from the day after the latest date in DB
-        start_date = (datetime.combine(latest_db_date, datetime.min.time()) + timedelta(days=1)).replace(tzinfo=timezone.utc)
+    if latest_date:
+        # Start from the day after the latest loaded date
+        start_date = (datetime.combine(latest_date, datetime.min.time()) + timedelta(days=1)).replace(tzinfo=timezone.utc)
         log(f"📊 Starting from day after latest data in DB: {start_date.strftime('%Y-%m-%d')}")
     else:
         # Start from a default date
@@ -209,6 +317,9 @@ def main():
             log(f"❌ Failed to process batch {current_start.strftime('%Y-%m-%d')} to {batch_end.strftime('%Y-%m-%d')}")
             break
     
+    # All batches are in; let the ingestion service finish up
+    close_ingestion()
+    
     # Generate OHLC candles
     if success:
         log("📊 Generating OHLC candles...")
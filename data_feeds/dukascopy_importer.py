@@ -5,15 +5,21 @@ Downloads high-quality tick data from Dukascopy and imports into QuestDB
 """
 
 import os
-import struct
 import lzma
+import socket
+import tempfile
+import threading
 import requests
+from urllib3.util.retry import Retry
 import pandas as pd
 from datetime import datetime, timedelta, timezone
 import time
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Tuple, Optional
+from collections import deque
+from contextlib import contextmanager, suppress
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
 import numpy as np
 
 # Configure logging
@@ -23,11 +29,82 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Packed big-endian tick record in a .bi5 file
+TICK_DTYPE = np.dtype([
+    ('time', '>u4'),
+    ('ask', '>u4'),
+    ('bid', '>u4'),
+    ('ask_volume', '>f4'),
+    ('bid_volume', '>f4')
+])
+
+# Decoded ticks are kept as one contiguous native-endian array per column
+# (time in milliseconds since the hour start, prices and volumes as float64),
+# so the arithmetic that builds records runs over packed memory rather than
+# strided record fields
+TICK_COLUMNS = ('time', 'bid', 'ask', 'bid_volume', 'ask_volume')
+
+@contextmanager
+def cache_writer(path: str):
+    """Write a cache file through a temp file of its own, moved onto path
+    only if the block completes and wrote something. Concurrent writers of
+    the same file never share a temp file, and a failed write leaves none
+    behind"""
+    f = tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(path), prefix=os.path.basename(path) + '.',
+        suffix='.part', delete=False
+    )
+    try:
+        with f:
+            yield f
+            written = f.tell() > 0
+        if written:
+            os.replace(f.name, path)
+    finally:
+        with suppress(FileNotFoundError):
+            os.remove(f.name)
+
+def frame_rows(frame: pd.DataFrame):
+    """Iterate over a DataFrame's rows as tuples of plain Python values"""
+    # to_numpy() first: tolist() on pandas' own string arrays goes element
+    # by element
+    return zip(*[frame[column].to_numpy().tolist() for column in frame.columns])
+
+def iso_timestamps(epoch_ms: np.ndarray) -> np.ndarray:
+    """UTC ISO 8601 strings for millisecond epoch times, formatted like
+    datetime.isoformat() (fraction only when non-zero, +00:00 suffix)"""
+    times = epoch_ms.astype('datetime64[ms]')
+    timestamps = np.where(
+        epoch_ms % 1000 == 0,
+        np.datetime_as_string(times, unit='s'),
+        np.datetime_as_string(times, unit='us')
+    )
+    return np.char.add(timestamps, '+00:00').astype(object)
+
 class DukascopyDownloader:
     """Download and process Dukascopy tick data"""
     
     BASE_URL = "https://datafeed.dukascopy.com/datafeed"
     
+    # Hour downloads in flight at once. They spend nearly all their time
+    # waiting on the network, so this is far wider than the processing pool
+    DOWNLOAD_CONCURRENCY = 64
+    
+    # How long after an hour ends a missing file for it is taken as final
+    MISSING_SETTLE_TIME = timedelta(days=1)
+    
+    # Ticks per ILP write when importing a date range
+    ILP_BATCH_TICKS = 100_000
+    
+    # How long to wait for ILP rows to become visible to queries, and how
+    # often to check
+    ILP_CONFIRM_TIMEOUT = 60
+    ILP_CONFIRM_POLL = 0.5
+    
+    # Downloaded hours are cached next to this module, so every script
+    # shares one cache whatever directory it is started from
+    DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dukascopy_cache")
+    
     # Dukascopy instrument IDs
     INSTRUMENTS = {
         'EURUSD': 'EURUSD',
@@ -42,17 +119,50 @@ class DukascopyDownloader:
         'GBPJPY': 'GBPJPY'
     }
     
-    def __init__(self, questdb_url="http://localhost:9000", cache_dir="./dukascopy_cache"):
+    def __init__(self, questdb_url="http://localhost:9000", cache_dir=None,
+                 ilp_port=9009, use_cache=True):
         self.questdb_url = questdb_url
-        self.cache_dir = cache_dir
-        os.makedirs(cache_dir, exist_ok=True)
         
-        # Create a session for connection pooling
+        # Ticks go in over one persistent ILP connection, opened on first
+        # use and shared by all worker threads
+        self.ilp_address = (urlsplit(questdb_url).hostname, ilp_port)
+        self._ilp_socket = None
+        self._ilp_lock = threading.Lock()
+        
+        # With use_cache off, every hour is downloaded and decoded again;
+        # the fresh copies still replace what is in the cache
+        self.cache_dir = cache_dir or self.DEFAULT_CACHE_DIR
+        self.use_cache = use_cache
+        os.makedirs(self.cache_dir, exist_ok=True)
+        
+        # Trading session and market-open flag for each of the 168
+        # (ISO weekday, UTC hour) slots, indexed by (day_of_week - 1) * 24 + hour
+        slots = [(day_of_week, hour) for day_of_week in range(1, 8) for hour in range(24)]
+        self.session_table = np.array(
+            [self.determine_trading_session(hour) for _, hour in slots], dtype=object
+        )
+        self.market_open_table = np.array(
+            [self.is_market_open(hour, day_of_week) for day_of_week, hour in slots]
+        )
+        
+        # Decoded tick arrays, so re-runs over cached hours skip LZMA
+        self.decoded_dir = os.path.join(self.cache_dir, "decoded")
+        os.makedirs(self.decoded_dir, exist_ok=True)
+        
+        # Create a session for connection pooling, with room to keep a
+        # connection alive for every concurrent download
         self.session = requests.Session()
+        self.session.headers.update({
+            'Connection': 'keep-alive',
+            # .bi5 files are already LZMA compressed
+            'Accept-Encoding': 'identity'
+        })
         adapter = requests.adapters.HTTPAdapter(
             pool_connections=10,
-            pool_maxsize=10,
-            max_retries=3
+            pool_maxsize=max(self.DOWNLOAD_CONCURRENCY * 2, 100),
+            max_retries=Retry(total=3, backoff_factor=0.2,
+                              status_forcelist=[502, 503, 504],
+                              raise_on_status=False)
         )
         self.session.mount('http://', adapter)
         self.session.mount('https://', adapter)
@@ -75,106 +185,155 @@ class DukascopyDownloader:
             f"{instrument}_{date.strftime('%Y%m%d')}_{hour:02d}.bi5"
         )
         
-        if os.path.exists(cache_file):
+        if self.use_cache and os.path.exists(cache_file):
             logger.debug(f"Using cached file: {cache_file}")
             with open(cache_file, 'rb') as f:
                 return f.read()
         
+        # Hours known to have no data are remembered with an empty marker
+        missing_file = f"{cache_file}.missing"
+        if self.use_cache and os.path.exists(missing_file):
+            logger.debug(f"No data for {instrument} {date.date()} {hour:02d}:00 (cached)")
+            return None
+        
         try:
-            response = self.session.get(url, timeout=30)
-            if response.status_code == 200 and len(response.content) > 0:
-                # Cache the data
-                with open(cache_file, 'wb') as f:
-                    f.write(response.content)
-                return response.content
-            else:
+            with self.session.get(url, timeout=30, stream=True) as response:
+                if response.status_code != 200:
+                    logger.debug(f"No data for {instrument} {date.date()} {hour:02d}:00")
+                    if response.status_code == 404:
+                        self.mark_missing(missing_file, date, hour)
+                    return None
+                
+                # Cache the data as it arrives. It only replaces the cache
+                # file once complete, so a dropped download can never be
+                # served from the cache later
+                chunks = []
+                with cache_writer(cache_file) as f:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+                        chunks.append(chunk)
+            
+            if not chunks:
                 logger.debug(f"No data for {instrument} {date.date()} {hour:02d}:00")
+                self.mark_missing(missing_file, date, hour)
                 return None
+            
+            return b''.join(chunks)
         except Exception as e:
             logger.error(f"Error downloading {url}: {e}")
             return None
     
-    def decompress_tick_data(self, compressed_data: bytes) -> List[Tuple]:
-        """Decompress and parse Dukascopy tick data"""
+    def mark_missing(self, missing_file: str, date: datetime, hour: int):
+        """Remember that an hour has no data, once it is old enough to be final"""
+        # Dukascopy publishes an hour's file some time after the hour ends;
+        # until then a 404 only means "not yet"
+        hour_end = datetime(date.year, date.month, date.day, hour, tzinfo=timezone.utc) + timedelta(hours=1)
+        if datetime.now(timezone.utc) - hour_end > self.MISSING_SETTLE_TIME:
+            open(missing_file, 'w').close()
+    
+    def read_raw_ticks(self, compressed_data: bytes) -> np.ndarray:
+        """Decompress Dukascopy tick data into TICK_DTYPE records of valid ticks"""
         try:
             # Decompress LZMA data
             decompressed = lzma.decompress(compressed_data)
             
-            # Parse binary format
+            # Parse binary format in one pass over the buffer
             # Each tick is 20 bytes: time(4) + ask(4) + bid(4) + ask_vol(4) + bid_vol(4)
-            ticks = []
-            tick_size = 20
-            
-            for i in range(0, len(decompressed), tick_size):
-                if i + tick_size <= len(decompressed):
-                    tick_data = struct.unpack('>IIIff', decompressed[i:i+tick_size])
-                    
-                    # tick_data = (time_delta, ask, bid, ask_volume, bid_volume)
-                    time_delta = tick_data[0]  # milliseconds since hour start
-                    ask = tick_data[1] / 100000.0  # Convert to price
-                    bid = tick_data[2] / 100000.0
-                    ask_volume = tick_data[3]
-                    bid_volume = tick_data[4]
-                    
-                    ticks.append((time_delta, bid, ask, bid_volume, ask_volume))
+            # A trailing partial tick is ignored
+            usable = len(decompressed) - len(decompressed) % TICK_DTYPE.itemsize
+            raw = np.frombuffer(decompressed, dtype=TICK_DTYPE, count=usable // TICK_DTYPE.itemsize)
             
-            return ticks
+            # Skip invalid prices before anything is computed from them
+            raw_bid, raw_ask = raw['bid'], raw['ask']
+            return raw[(raw_bid > 0) & (raw_ask > 0) & (raw_bid < raw_ask)]
         except Exception as e:
             logger.error(f"Error decompressing data: {e}")
-            return []
+            return np.empty(0, dtype=TICK_DTYPE)
     
-    def process_hour_ticks(self, instrument: str, date: datetime, hour: int, 
-                          compressed_data: bytes) -> List[dict]:
-        """Process one hour of tick data into records"""
-        ticks = self.decompress_tick_data(compressed_data)
+    def scale_ticks(self, raw: np.ndarray) -> Dict[str, np.ndarray]:
+        """Convert TICK_DTYPE records into one array per TICK_COLUMNS field"""
+        # time is milliseconds since hour start; prices are in 1/100000
+        return {
+            'time': raw['time'].astype(np.int64),
+            'bid': raw['bid'] / 100000.0,
+            'ask': raw['ask'] / 100000.0,
+            'bid_volume': raw['bid_volume'].astype(np.float64),
+            'ask_volume': raw['ask_volume'].astype(np.float64)
+        }
+    
+    def decompress_tick_data(self, compressed_data: bytes) -> Dict[str, np.ndarray]:
+        """Decompress and parse Dukascopy tick data into per-column arrays of valid ticks"""
+        return self.scale_ticks(self.read_raw_ticks(compressed_data))
+    
+    def load_hour_ticks(self, instrument: str, date: datetime, hour: int,
+                        compressed_data: bytes) -> Dict[str, np.ndarray]:
+        """Decoded ticks for one hour, from the decoded cache when available"""
+        decoded_file = os.path.join(
+            self.decoded_dir,
+            f"{instrument}_{date.strftime('%Y%m%d')}_{hour:02d}.npy"
+        )
         
-        if not ticks:
-            return []
+        if self.use_cache and os.path.exists(decoded_file):
+            try:
+                raw = np.load(decoded_file)
+                if raw.dtype == TICK_DTYPE:
+                    return self.scale_ticks(raw)
+            except (OSError, ValueError) as e:
+                logger.debug(f"Ignoring unreadable decoded cache {decoded_file}: {e}")
+        
+        # The cache keeps the valid ticks as packed 20-byte records, half
+        # the size of the scaled columns and quick to scale again
+        raw = self.read_raw_ticks(compressed_data)
+        if len(raw) > 0:
+            # Write then rename, so a reader never sees a partial file
+            try:
+                with cache_writer(decoded_file) as f:
+                    np.save(f, raw)
+            except OSError as e:
+                logger.debug(f"Could not write decoded cache {decoded_file}: {e}")
+        return self.scale_ticks(raw)
+    
+    def process_hour_frame(self, instrument: str, date: datetime, hour: int,
+                           compressed_data: bytes) -> pd.DataFrame:
+        """Process one hour of tick data into a DataFrame with one column per record field,
+        indexed by tick time in nanoseconds since the epoch"""
+        ticks = self.load_hour_ticks(instrument, date, hour, compressed_data)
         
         # Base timestamp for this hour
         base_time = datetime(date.year, date.month, date.day, hour, tzinfo=timezone.utc)
         
-        records = []
-        for tick in ticks:
-            time_delta, bid, ask, bid_vol, ask_vol = tick
-            
-            # Calculate actual timestamp
-            timestamp = base_time + timedelta(milliseconds=time_delta)
-            
-            # Skip invalid prices
-            if bid <= 0 or ask <= 0 or bid >= ask:
-                continue
-            
-            # Calculate derived fields
-            mid_price = (bid + ask) / 2
-            spread = ask - bid
-            total_volume = bid_vol + ask_vol
-            
-            # Determine trading session
-            hour_utc = timestamp.hour
-            day_of_week = timestamp.isoweekday()
-            session = self.determine_trading_session(hour_utc)
-            market_open = self.is_market_open(hour_utc, day_of_week)
-            
-            record = {
-                'timestamp': timestamp.isoformat(),
-                'symbol': instrument,
-                'bid': bid,
-                'ask': ask,
-                'price': mid_price,
-                'spread': spread,
-                'volume': total_volume,
-                'bid_volume': bid_vol,
-                'ask_volume': ask_vol,
-                'hour_of_day': hour_utc,
-                'day_of_week': day_of_week,
-                'trading_session': session,
-                'market_open': market_open
-            }
-            
-            records.append(record)
+        # Hour and ISO weekday of each tick, from milliseconds since the
+        # epoch (1970-01-01 was a Thursday)
+        epoch_ms = int(base_time.timestamp()) * 1000 + ticks['time']
+        hour_utc = epoch_ms // 3_600_000 % 24
+        day_of_week = (epoch_ms // 86_400_000 + 3) % 7 + 1
+        slot = (day_of_week - 1) * 24 + hour_utc
+        
+        bid, ask = ticks['bid'], ticks['ask']
+        return pd.DataFrame({
+            'timestamp': iso_timestamps(epoch_ms),
+            'symbol': instrument,
+            'bid': bid,
+            'ask': ask,
+            'price': (bid + ask) / 2,
+            'spread': ask - bid,
+            'volume': ticks['bid_volume'] + ticks['ask_volume'],
+            'bid_volume': ticks['bid_volume'],
+            'ask_volume': ticks['ask_volume'],
+            'hour_of_day': hour_utc,
+            'day_of_week': day_of_week,
+            'trading_session': self.session_table[slot],
+            'market_open': self.market_open_table[slot]
+        }, index=pd.Index(epoch_ms * 1_000_000, name='epoch_ns'))
+    
+    def process_hour_ticks(self, instrument: str, date: datetime, hour: int, 
+                          compressed_data: bytes) -> List[dict]:
+        """Process one hour of tick data into records"""
+        frame = self.process_hour_frame(instrument, date, hour, compressed_data)
         
-        return records
+        # Only build per-tick dicts here, at the hand-off to the ILP bridges
+        fields = frame.columns.tolist()
+        return [dict(zip(fields, row)) for row in frame_rows(frame)]
     
     def determine_trading_session(self, hour: int) -> str:
         """Determine trading session based on UTC hour"""
@@ -269,48 +428,90 @@ class DukascopyDownloader:
             logger.error(f"Error executing query: {e}")
             return None
     
-    def insert_batch(self, records: List[dict]) -> bool:
-        """Insert batch of records into QuestDB"""
-        if not records:
+    def insert_batch_ilp(self, ticks: pd.DataFrame) -> bool:
+        """Insert batch of ticks (a process_hour_frame DataFrame) over the ILP socket"""
+        if ticks.empty:
             return True
         
-        # Build bulk insert query
-        values = []
-        for r in records:
-            values.append(
-                f"('{r['timestamp']}', '{r['symbol']}', "
-                f"{r['bid']}, {r['ask']}, {r['price']}, {r['spread']}, "
-                f"{r['volume']}, {r['bid_volume']}, {r['ask_volume']}, "
-                f"{r['hour_of_day']}, {r['day_of_week']}, '{r['trading_session']}', "
-                f"{r['market_open']})"
-            )
-        
-        # Insert in chunks of 1000 to avoid query size limits
-        chunk_size = 1000
-        for i in range(0, len(values), chunk_size):
-            chunk = values[i:i + chunk_size]
-            query = f"""
-            INSERT INTO market_data_v2 VALUES {', '.join(chunk)};
-            """
-            
-            result = self.execute_query(query)
-            if result is None:
+        # The whole batch is formatted in one pass into a single payload.
+        # ILP timestamps are nanoseconds since the epoch, as in the index
+        lines = [
+            f"market_data_v2,symbol={symbol},trading_session={trading_session} "
+            f"bid={bid},ask={ask},price={price},spread={spread},"
+            f"volume={volume},bid_volume={bid_volume},ask_volume={ask_volume},"
+            f"hour_of_day={hour_of_day}i,day_of_week={day_of_week}i,"
+            f"market_open={'t' if market_open else 'f'} {timestamp}\n"
+            for (_, symbol, bid, ask, price, spread, volume, bid_volume, ask_volume,
+                 hour_of_day, day_of_week, trading_session, market_open), timestamp
+            in zip(frame_rows(ticks), ticks.index.to_numpy().tolist())
+        ]
+        payload = ''.join(lines).encode()
+        
+        with self._ilp_lock:
+            try:
+                if self._ilp_socket is None:
+                    self._ilp_socket = socket.create_connection(self.ilp_address, timeout=30)
+                self._ilp_socket.sendall(payload)
+                return True
+            except OSError as e:
+                logger.error(f"Error sending to ILP at {self.ilp_address}: {e}")
+                # Reconnect on the next batch
+                if self._ilp_socket is not None:
+                    self._ilp_socket.close()
+                    self._ilp_socket = None
                 return False
-        
-        return True
+    
+    def close_ilp(self):
+        """Close the ILP connection, flushing what was sent to the server"""
+        # ILP over TCP has no acknowledgements: a completed send only means
+        # the bytes reached the kernel. Use wait_for_ticks to confirm rows
+        # actually landed in QuestDB
+        with self._ilp_lock:
+            if self._ilp_socket is not None:
+                self._ilp_socket.close()
+                self._ilp_socket = None
+    
+    def count_ticks(self, instrument: str, start: datetime, end: datetime) -> Optional[int]:
+        """Number of market_data_v2 ticks for instrument in [start, end), or None if the query fails"""
+        if instrument not in self.INSTRUMENTS:
+            raise ValueError(f"Unknown instrument: {instrument}")
+        
+        result = self.execute_query(
+            f"SELECT count(*) FROM market_data_v2 WHERE symbol = '{instrument}' "
+            f"AND timestamp >= '{start.strftime('%Y-%m-%dT%H:%M:%S.%fZ')}' "
+            f"AND timestamp < '{end.strftime('%Y-%m-%dT%H:%M:%S.%fZ')}'"
+        )
+        if result and result.get('dataset'):
+            return result['dataset'][0][0]
+        return None
+    
+    def wait_for_ticks(self, instrument: str, start: datetime, end: datetime,
+                       expected: int) -> Optional[int]:
+        """Wait until QuestDB holds at least expected ticks for instrument in
+        [start, end); returns the last count seen (None if it could not be read)"""
+        deadline = time.monotonic() + self.ILP_CONFIRM_TIMEOUT
+        while True:
+            count = self.count_ticks(instrument, start, end)
+            if (count is not None and count >= expected) or time.monotonic() >= deadline:
+                return count
+            time.sleep(self.ILP_CONFIRM_POLL)
     
     def download_date_range(self, instrument: str, start_date: datetime, 
-                           end_date: datetime, max_workers: int = 10):
-        """Download data for a date range using parallel processing"""
+                           end_date: datetime, max_workers: Optional[int] = None):
+        """Download data for a date range as a pipeline: downloads run on a
+        wide I/O pool and feed decoding and inserting on max_workers threads
+        (one per CPU by default)"""
         logger.info(f"Downloading {instrument} from {start_date.date()} to {end_date.date()}")
+        max_workers = max_workers or os.cpu_count() or 1
         
-        # Generate list of all hours to download
+        # Generate list of all hours to download, skipping the hours the
+        # market is closed (Friday 22:00 UTC to Sunday 22:00 UTC)
         tasks = []
         current = start_date
         while current <= end_date:
-            # Skip weekends (market closed)
-            if current.weekday() < 5:  # Monday = 0, Friday = 4
-                for hour in range(24):
+            first_slot = (current.isoweekday() - 1) * 24
+            for hour in range(24):
+                if self.market_open_table[first_slot + hour]:
                     tasks.append((instrument, current, hour))
             current += timedelta(days=1)
         
@@ -321,28 +522,100 @@ class DukascopyDownloader:
         error_count = 0
         total_ticks = 0
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_task = {}
-            for task in tasks:
-                future = executor.submit(self.process_single_hour, *task)
-                future_to_task[future] = task
+        # Hours between the start of their download and the end of their
+        # processing. Capping this keeps downloaded payloads from piling up
+        # when the network is faster than decoding
+        max_in_flight = self.DOWNLOAD_CONCURRENCY + 2 * max_workers
+        pending_tasks = iter(tasks)
+        in_flight = {}  # future -> (stage, task)
+        
+        # Processed hours waiting to be inserted, and inserts queued on the
+        # writer (future, tasks, tick count), oldest first
+        buffered = []
+        buffered_ticks = 0
+        inserts = deque()
+        
+        with ThreadPoolExecutor(max_workers=self.DOWNLOAD_CONCURRENCY) as fetchers, \
+             ThreadPoolExecutor(max_workers=max_workers) as executor, \
+             ThreadPoolExecutor(max_workers=1) as writer:
+            def start_download():
+                task = next(pending_tasks, None)
+                if task is not None:
+                    in_flight[fetchers.submit(self.download_hour_data, *task)] = ('download', task)
             
-            # Process completed tasks
-            for future in as_completed(future_to_task):
-                task = future_to_task[future]
+            def finish_insert():
+                nonlocal processed_count, total_ticks, error_count
+                future, batch_tasks, tick_count = inserts.popleft()
                 try:
-                    tick_count = future.result()
-                    if tick_count > 0:
-                        processed_count += 1
-                        total_ticks += tick_count
-                        
-                        if processed_count % 100 == 0:
-                            logger.info(f"Progress: {processed_count}/{len(tasks)} hours, "
-                                      f"{total_ticks:,} ticks")
+                    success = future.result()
                 except Exception as e:
-                    error_count += 1
-                    logger.error(f"Error processing {task}: {e}")
+                    logger.error(f"Error inserting batch: {e}")
+                    success = False
+                
+                if success:
+                    processed_count += len(batch_tasks)
+                    total_ticks += tick_count
+                    logger.info(f"Progress: {processed_count}/{len(tasks)} hours, "
+                              f"{total_ticks:,} ticks")
+                else:
+                    error_count += len(batch_tasks)
+                    logger.error(f"Failed to insert {len(batch_tasks)} hours "
+                               f"from {batch_tasks[0][1].date()} {batch_tasks[0][2]:02d}:00")
+            
+            def flush():
+                nonlocal buffered, buffered_ticks
+                frame = pd.concat([frame for _, frame in buffered])
+                batch_tasks = [task for task, _ in buffered]
+                inserts.append((writer.submit(self.insert_batch_ilp, frame), batch_tasks,
+                                buffered_ticks))
+                buffered, buffered_ticks = [], 0
+                
+                # Don't let batches queue up behind a slow writer
+                while len(inserts) > 2:
+                    finish_insert()
+            
+            for _ in range(max_in_flight):
+                start_download()
+            
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, task = in_flight.pop(future)
+                    
+                    # Hand each downloaded hour straight to the processing pool
+                    if stage == 'download':
+                        compressed_data = future.result()
+                        if compressed_data:
+                            processing = executor.submit(self.process_hour_frame, *task,
+                                                         compressed_data)
+                            in_flight[processing] = ('process', task)
+                        else:
+                            start_download()
+                        continue
+                    
+                    # Processed hours are inserted in large batches by the
+                    # single writer thread
+                    start_download()
+                    try:
+                        frame = future.result()
+                    except Exception as e:
+                        error_count += 1
+                        logger.error(f"Error processing {task}: {e}")
+                        continue
+                    
+                    if not frame.empty:
+                        buffered.append((task, frame))
+                        buffered_ticks += len(frame)
+                        if buffered_ticks >= self.ILP_BATCH_TICKS:
+                            flush()
+            
+            if buffered:
+                flush()
+            while inserts:
+                finish_insert()
+        
+        # Make the new ticks visible to the queries that usually follow
+        self.close_ilp()
         
         logger.info(f"Completed {instrument}: {processed_count} hours, "
                    f"{total_ticks:,} total ticks, {error_count} errors")
@@ -356,22 +629,32 @@ class DukascopyDownloader:
         if not compressed_data:
             return 0
         
+        return self.process_downloaded_hour(instrument, date, hour, compressed_data)
+    
+    def process_downloaded_hour(self, instrument: str, date: datetime, hour: int,
+                                compressed_data: bytes) -> int:
+        """Process and insert a single hour of already downloaded data"""
         # Process ticks
-        records = self.process_hour_ticks(instrument, date, hour, compressed_data)
-        if not records:
+        ticks = self.process_hour_frame(instrument, date, hour, compressed_data)
+        if ticks.empty:
             return 0
         
         # Insert into database
-        success = self.insert_batch(records)
+        success = self.insert_batch_ilp(ticks)
         if success:
-            return len(records)
+            return len(ticks)
         else:
             raise Exception("Failed to insert batch")
     
-    def generate_ohlcv(self, timeframe: str = '1m'):
-        """Generate OHLCV data from tick data"""
+    def generate_ohlcv(self, timeframe: str = '1m', since: Optional[datetime] = None):
+        """Generate OHLCV data from tick data, optionally only from the day of since on"""
         logger.info(f"Generating {timeframe} OHLCV data...")
         
+        # Starting at midnight keeps every bar up to 1d whole
+        where = "volume > 0"
+        if since is not None:
+            where += f" AND timestamp >= '{since.date().isoformat()}'"
+        
         query = f"""
         INSERT INTO ohlc_{timeframe}_v2
         SELECT 
@@ -386,7 +669,7 @@ class DukascopyDownloader:
             sum(price * volume) / sum(volume) AS vwap,
             first(trading_session) AS trading_session
         FROM market_data_v2
-        WHERE volume > 0
+        WHERE {where}
         SAMPLE BY {timeframe} ALIGN TO CALENDAR
         """
         
@@ -396,6 +679,13 @@ class DukascopyDownloader:
         else:
             logger.error(f"Failed to generate {timeframe} OHLCV data")
     
+    def generate_ohlcv_timeframes(self, timeframes: List[str], since: Optional[datetime] = None):
+        """Generate OHLCV data for several timeframes at once"""
+        # Each timeframe is a single query covering every symbol; running
+        # them side by side lets QuestDB work on all of them concurrently
+        with ThreadPoolExecutor(max_workers=len(timeframes)) as executor:
+            list(executor.map(lambda tf: self.generate_ohlcv(tf, since), timeframes))
+    
     def get_data_summary(self):
         """Get summary of downloaded data"""
         query = """
@@ -464,9 +754,8 @@ def main():
             for instrument in downloader.INSTRUMENTS:
                 downloader.download_date_range(instrument, start_date, end_date)
             
-            # Generate OHLCV
-            for tf in ['1m', '5m', '15m', '1h']:
-                downloader.generate_ohlcv(tf)
+            # Generate OHLCV for the downloaded range only
+            downloader.generate_ohlcv_timeframes(['1m', '5m', '15m', '1h'], since=start_date)
         
         elif choice == '2':
             # Last 30 days
@@ -476,9 +765,8 @@ def main():
             for instrument in downloader.INSTRUMENTS:
                 downloader.download_date_range(instrument, start_date, end_date)
             
-            # Generate OHLCV
-            for tf in ['1m', '5m', '15m', '1h']:
-                downloader.generate_ohlcv(tf)
+            # Generate OHLCV for the downloaded range only
+            downloader.generate_ohlcv_timeframes(['1m', '5m', '15m', '1h'], since=start_date)
         
         elif choice == '3':
             # Custom range
@@ -519,8 +807,7 @@ def main():
         elif choice == '5':
             # Generate OHLCV
             print("\nGenerating all OHLCV timeframes...")
-            for tf in ['1m', '5m', '15m', '30m', '1h', '4h', '1d']:
-                downloader.generate_ohlcv(tf)
+            downloader.generate_ohlcv_timeframes(['1m', '5m', '15m', '30m', '1h', '4h', '1d'])
         
         elif choice == '6':
             # Show summary
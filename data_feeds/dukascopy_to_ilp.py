@@ -1,82 +1,94 @@
 #!/usr/bin/env python3
 """
-Bridge between Dukascopy downloader and Go ILP ingestion
+Bridge between Dukascopy downloader and QuestDB ILP ingestion
 *Created: May 25, 2025*
 """
 
 import sys
-import json
-import subprocess
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
 from dukascopy_importer import DukascopyDownloader
 
+DOWNLOAD_WORKERS = 8  # Parallel hourly downloads
+
 def main():
-    if len(sys.argv) < 4:
-        print("Usage: dukascopy_to_ilp.py <symbol> <start_date> <end_date>")
+    # --no-cache downloads every hour again instead of reusing cached files
+    use_cache = '--no-cache' not in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != '--no-cache']
+    
+    if len(args) < 3:
+        print("Usage: dukascopy_to_ilp.py <symbol> <start_date> <end_date> [--no-cache]")
         print("Example: dukascopy_to_ilp.py EURUSD 2024-01-19 2024-01-26")
         sys.exit(1)
     
-    symbol = sys.argv[1]
-    start_date = datetime.fromisoformat(sys.argv[2]).replace(tzinfo=timezone.utc)
-    end_date = datetime.fromisoformat(sys.argv[3]).replace(tzinfo=timezone.utc)
+    symbol = args[0]
+    start_date = datetime.fromisoformat(args[1]).replace(tzinfo=timezone.utc)
+    end_date = datetime.fromisoformat(args[2]).replace(tzinfo=timezone.utc)
+    
+    if symbol not in DukascopyDownloader.INSTRUMENTS:
+        print(f"❌ Unknown symbol {symbol} (available: {', '.join(DukascopyDownloader.INSTRUMENTS)})")
+        sys.exit(1)
     
     print(f"📊 Downloading {symbol} from {start_date.date()} to {end_date.date()}...")
     
     # Initialize downloader
-    downloader = DukascopyDownloader()
+    downloader = DukascopyDownloader(use_cache=use_cache)
     
-    # Download data
-    downloader.download_date_range([symbol], start_date, end_date)
-    
-    # Get the downloaded data by processing each hour
-    all_records = []
+    # Every (day, hour) in the range, in chronological order
+    tasks = []
     current = start_date
     
     while current <= end_date:
         for hour in range(24):
             if current.replace(hour=hour) > end_date:
                 break
-                
-            # Download hour data
-            data = downloader.download_hour_data(symbol, current, hour)
-            if data:
-                # Process into records
-                records = downloader.process_hour_ticks(symbol, current, hour, data)
-                all_records.extend(records)
+            tasks.append((current, hour))
         
         # Move to next day
         current = current.replace(hour=0) + timedelta(days=1)
     
-    print(f"✅ Downloaded {len(all_records)} ticks")
+    # Ticks already in the range, so the new ones can be confirmed after
+    range_start = start_date
+    range_end = end_date.replace(hour=0) + timedelta(days=1)
+    existing_ticks = downloader.count_ticks(symbol, range_start, range_end) or 0
     
-    if all_records:
-        print("📤 Sending to ILP ingestion service...")
-        
-        # Convert to JSON and pipe to Go ingestion service
-        json_data = json.dumps(all_records, default=str)
-        
-        # Run the Go ingestion service
-        process = subprocess.Popen(
-            ['/home/millet_frazier/SPtrader/build/ingestion', '-python'],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True
+    # Download and process each hour - the fetches are I/O bound, so run
+    # them side by side; map() hands the results back in task order
+    total_ticks = 0
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        downloads = executor.map(
+            lambda task: downloader.download_hour_data(symbol, *task), tasks
         )
-        
-        # Send data and get output
-        output, _ = process.communicate(input=json_data)
-        print(output)
-        
-        if process.returncode == 0:
-            print("✅ Data successfully ingested via ILP!")
-        else:
-            print(f"❌ Ingestion failed with code {process.returncode}")
-            sys.exit(1)
-    else:
+        for (day, hour), data in zip(tasks, downloads):
+            if not data:
+                continue
+            
+            # Process into ticks and write each hour straight to QuestDB's
+            # ILP port, so only one hour is held in memory at a time
+            ticks = downloader.process_hour_frame(symbol, day, hour, data)
+            if ticks.empty:
+                continue
+            
+            if not downloader.insert_batch_ilp(ticks):
+                executor.shutdown(cancel_futures=True)
+                print(f"❌ Ingestion failed at {day.date()} {hour:02d}:00")
+                sys.exit(1)
+            total_ticks += len(ticks)
+    
+    downloader.close_ilp()
+    
+    if not total_ticks:
         print("❌ No data downloaded")
         sys.exit(1)
+    
+    # ILP sends are not acknowledged, so check QuestDB actually has the rows
+    expected = existing_ticks + total_ticks
+    count = downloader.wait_for_ticks(symbol, range_start, range_end, expected)
+    if count is None or count < expected:
+        print(f"❌ Sent {total_ticks} ticks via ILP, but QuestDB shows "
+              f"{'no count' if count is None else count - existing_ticks} new")
+        sys.exit(1)
+    print(f"✅ {total_ticks} ticks successfully ingested via ILP!")
 
 if __name__ == "__main__":
-    from datetime import timedelta
     main()
\ No newline at end of file
@@ -1,19 +1,23 @@
 #!/usr/bin/env python3
 """
-Batched bridge between Dukascopy downloader and Go ILP ingestion
+Batched bridge between Dukascopy downloader and QuestDB ILP ingestion
 Processes data in daily batches to avoid memory issues
 *Created: May 27, 2025*
 """
 
 import sys
 import json
-import subprocess
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from dukascopy_importer import DukascopyDownloader
 
 # Configuration
 BATCH_DAYS = 3  # Process 3 days at a time
+DOWNLOAD_WORKERS = 8  # Parallel hourly downloads per batch
+WRITE_QUEUE_HOURS = 8  # Processed hours waiting on the ILP writer
 STATE_FILE = "/home/millet_frazier/SPtrader/data_feeds/.batch_progress.json"
 
 def load_progress():
@@ -25,63 +29,58 @@ def load_progress():
 
 def save_progress(progress):
     """Save progress to state file"""
-    with open(STATE_FILE, 'w') as f:
-        json.dump(progress, f, indent=2)
-
-def send_to_ilp(records, symbol):
-    """Send batch of records to ILP ingestion"""
-    if not records:
-        return True
-    
-    print(f"  📤 Sending {len(records)} ticks to ILP...")
-    
-    # Convert to JSON and pipe to Go ingestion service
-    json_data = json.dumps(records, default=str)
-    
-    # Run the Go ingestion service
-    process = subprocess.Popen(
-        ['/home/millet_frazier/SPtrader/build/ingestion', '-python'],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True
-    )
-    
-    # Send data and get output
-    output, _ = process.communicate(input=json_data)
-    
-    if process.returncode == 0:
-        print(f"  ✅ Batch successfully ingested!")
-        return True
-    else:
-        print(f"  ❌ Ingestion failed: {output}")
-        return False
+    # Write a temp file and rename it into place, so a crash mid-write
+    # leaves the previous state intact
+    tmp_file = STATE_FILE + ".tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(progress, f, separators=(',', ':'))
+    os.replace(tmp_file, STATE_FILE)
 
 def main():
-    if len(sys.argv) < 4:
-        print("Usage: dukascopy_to_ilp_batched.py <symbol> <start_date> <end_date>")
+    # --no-cache downloads every hour again instead of reusing cached files
+    use_cache = '--no-cache' not in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != '--no-cache']
+    
+    if len(args) < 3:
+        print("Usage: dukascopy_to_ilp_batched.py <symbol> <start_date> <end_date> [--no-cache]")
         print("Example: dukascopy_to_ilp_batched.py EURUSD 2023-10-01 2023-12-31")
         print("\nThis script processes data in batches and can be resumed if interrupted.")
         sys.exit(1)
     
-    symbol = sys.argv[1]
-    start_date = datetime.fromisoformat(sys.argv[2]).replace(tzinfo=timezone.utc)
-    end_date = datetime.fromisoformat(sys.argv[3]).replace(tzinfo=timezone.utc)
+    symbol = args[0]
+    start_date = datetime.fromisoformat(args[1]).replace(tzinfo=timezone.utc)
+    end_date = datetime.fromisoformat(args[2]).replace(tzinfo=timezone.utc)
+    
+    # The symbol ends up in SQL queries, so only known instruments are accepted
+    if symbol not in DukascopyDownloader.INSTRUMENTS:
+        print(f"❌ Unknown symbol {symbol} (available: {', '.join(DukascopyDownloader.INSTRUMENTS)})")
+        sys.exit(1)
     
     # Load progress
     progress = load_progress()
     job_key = f"{symbol}_{start_date.date()}_{end_date.date()}"
     
-    if job_key in progress:
-        last_processed = datetime.fromisoformat(progress[job_key]).replace(tzinfo=timezone.utc)
-        print(f"📂 Resuming from {last_processed.date()}...")
-        current = last_processed + timedelta(days=1)
+    # Start dates of the batches already ingested, kept as a set so each
+    # batch's check stays O(1) however long the job gets
+    saved = progress.get(job_key, [])
+    if isinstance(saved, str):
+        # Older state files only kept the last processed date
+        last_processed = datetime.fromisoformat(saved).replace(tzinfo=timezone.utc)
+        saved = []
+        batch_start = start_date
+        while min(batch_start + timedelta(days=BATCH_DAYS - 1), end_date) <= last_processed:
+            saved.append(batch_start.date().isoformat())
+            batch_start += timedelta(days=BATCH_DAYS)
+    completed = set(saved)
+    
+    if completed:
+        print(f"📂 Resuming, {len(completed)} batches already done...")
     else:
-        current = start_date
         print(f"📊 Starting batch download of {symbol} from {start_date.date()} to {end_date.date()}...")
+    current = start_date
     
     # Initialize downloader
-    downloader = DukascopyDownloader()
+    downloader = DukascopyDownloader(use_cache=use_cache)
     
     # Process in batches
     total_ticks = 0
@@ -90,48 +89,108 @@ def main():
     while current <= end_date:
         # Calculate batch end (up to BATCH_DAYS or end_date)
         batch_end = min(current + timedelta(days=BATCH_DAYS - 1), end_date)
+        batch_key = current.date().isoformat()
+        if batch_key in completed:
+            current = batch_end + timedelta(days=1)
+            continue
         
         print(f"\n🔄 Processing batch: {current.date()} to {batch_end.date()}")
         
         try:
-            # Download batch
-            print(f"  📥 Downloading...")
-            downloader.download_date_range([symbol], current, batch_end)
-            
-            # Process each day in the batch
-            batch_records = []
+            # Every (day, hour) in the batch, in chronological order
+            tasks = []
             batch_current = current
             
             while batch_current <= batch_end:
                 for hour in range(24):
                     if batch_current.replace(hour=hour) > batch_end:
                         break
-                    
-                    # Download hour data
-                    data = downloader.download_hour_data(symbol, batch_current, hour)
-                    if data:
-                        # Process into records
-                        records = downloader.process_hour_ticks(symbol, batch_current, hour, data)
-                        batch_records.extend(records)
+                    tasks.append((batch_current, hour))
                 
                 # Move to next day
                 batch_current = batch_current.replace(hour=0) + timedelta(days=1)
             
-            print(f"  ✅ Downloaded {len(batch_records)} ticks")
+            # Ticks already in the batch's range, so the new ones can be
+            # confirmed once sent
+            range_end = batch_end.replace(hour=0) + timedelta(days=1)
+            existing_ticks = downloader.count_ticks(symbol, current, range_end) or 0
+            
+            # Processed hours go to a writer thread through a bounded queue,
+            # so ILP sends overlap with fetching and decoding the next hours
+            # while a slow QuestDB still holds the downloads back
+            frames = queue.Queue(maxsize=WRITE_QUEUE_HOURS)
+            write_failed = threading.Event()
+            written = [0]
             
-            # Send batch to ILP
-            if batch_records:
-                if send_to_ilp(batch_records, symbol):
-                    total_ticks += len(batch_records)
+            def write_frames():
+                while True:
+                    ticks = frames.get()
+                    if ticks is None:
+                        return
+                    if write_failed.is_set():
+                        continue
+                    try:
+                        if downloader.insert_batch_ilp(ticks):
+                            written[0] += len(ticks)
+                        else:
+                            write_failed.set()
+                    except Exception as e:
+                        print(f"  ❌ Error writing ticks: {e}")
+                        write_failed.set()
+            
+            writer = threading.Thread(target=write_frames, daemon=True)
+            writer.start()
+            
+            # Download and process each hour - the fetches are I/O bound, so
+            # run them side by side; map() hands the results back in task order
+            print(f"  📥 Downloading...")
+            try:
+                with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+                    downloads = executor.map(
+                        lambda task: downloader.download_hour_data(symbol, *task), tasks
+                    )
+                    for (day, hour), data in zip(tasks, downloads):
+                        if write_failed.is_set():
+                            # No point fetching the rest of a batch that will be retried
+                            executor.shutdown(cancel_futures=True)
+                            break
+                        if not data:
+                            continue
+                        
+                        # Process into ticks and queue each hour for QuestDB's
+                        # ILP port, so only a few hours are held in memory
+                        ticks = downloader.process_hour_frame(symbol, day, hour, data)
+                        if not ticks.empty:
+                            frames.put(ticks)
+            finally:
+                frames.put(None)
+                writer.join()
+            batch_ticks = written[0]
+            ingested = not write_failed.is_set()
+            
+            downloader.close_ilp()
+            
+            # ILP sends are not acknowledged, so a batch is only recorded as
+            # done once QuestDB shows its rows
+            if ingested and batch_ticks:
+                expected = existing_ticks + batch_ticks
+                count = downloader.wait_for_ticks(symbol, current, range_end, expected)
+                if count is None or count < expected:
+                    print(f"  ⚠️  Sent {batch_ticks} ticks, but QuestDB shows "
+                          f"{'no count' if count is None else count - existing_ticks} new")
+                    ingested = False
+            
+            if ingested:
+                print(f"  ✅ Ingested {batch_ticks} ticks")
+                if batch_ticks:
+                    total_ticks += batch_ticks
                     # Update progress
-                    progress[job_key] = batch_end.isoformat()
+                    completed.add(batch_key)
+                    progress[job_key] = sorted(completed)
                     save_progress(progress)
-                else:
-                    failed_batches.append((current.date(), batch_end.date()))
-                    print(f"  ⚠️  Failed to ingest batch {current.date()} to {batch_end.date()}")
-            
-            # Clear memory
-            batch_records = None
+            else:
+                failed_batches.append((current.date(), batch_end.date()))
+                print(f"  ⚠️  Failed to ingest batch {current.date()} to {batch_end.date()}")
             
         except Exception as e:
             print(f"  ❌ Error processing batch: {e}")
@@ -158,8 +217,13 @@ def main():
     
     # Check database
     print("\n📊 Checking database...")
-    check_cmd = f'sptrader db query "SELECT count(*) FROM market_data_v2 WHERE symbol = \'{symbol}\' AND timestamp >= \'{start_date.date()}\'"'
-    os.system(check_cmd)
+    # Ask QuestDB directly over the downloader's pooled session rather
+    # than shelling out to the sptrader CLI
+    count = downloader.count_ticks(symbol, start_date, end_date.replace(hour=0) + timedelta(days=1))
+    if count is not None:
+        print(f"   {symbol} ticks from {start_date.date()} to {end_date.date()}: {count:,}")
+    else:
+        print("   ❌ Could not query QuestDB")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
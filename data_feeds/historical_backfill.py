@@ -5,6 +5,7 @@ Enhanced historical forex data backfill with better UX and performance
 """
 
 import requests
+from urllib3.util.retry import Retry
 import time
 import sys
 from datetime import datetime, timedelta, timezone
@@ -73,6 +74,21 @@ class HistoricalBackfillManager:
         # QuestDB Configuration
         self.questdb_url = questdb_url
         
+        # One pooled session for QuestDB and Oanda, so repeated queries and
+        # candle requests reuse their connections instead of reconnecting.
+        # Only failed connects are retried here: execute_query has its own
+        # retry loop, and re-sending a request that may have reached the
+        # server could repeat an INSERT
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=None, connect=3, read=0, status=0,
+                              other=0, redirect=0, backoff_factor=0.3)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
         # Instruments
         self.instruments = ["EUR_USD", "GBP_USD", "USD_JPY", "USD_CHF", "AUD_USD"]
         
@@ -91,9 +107,9 @@ class HistoricalBackfillManager:
         
         for attempt in range(max_retries):
             try:
-                response = requests.get(f"{self.questdb_url}/exec", 
-                                      params={"query": query}, 
-                                      timeout=30)
+                response = self.session.get(f"{self.questdb_url}/exec", 
+                                            params={"query": query}, 
+                                            timeout=30)
                 if response.status_code == 200:
                     return response.json()
                 else:
@@ -132,7 +148,7 @@ class HistoricalBackfillManager:
         print("  Checking Oanda API...", end='', flush=True)
         try:
             url = f"{self.oanda_base_url}/v3/accounts/{self.account_id}"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, headers=self.headers, timeout=10)
             if response.status_code == 200:
                 print(" ✅ Connected")
                 return True
@@ -155,7 +171,8 @@ class HistoricalBackfillManager:
             min(timestamp) as first_data,
             max(timestamp) as last_data,
             count(*) as record_count,
-            count(DISTINCT date_trunc('day', timestamp)) as days_covered
+            count(DISTINCT date_trunc('day', timestamp)) as days_covered,
+            avg(spread) as avg_spread
         FROM market_data
         GROUP BY symbol
         """
@@ -164,12 +181,13 @@ class HistoricalBackfillManager:
         
         if result and result.get('dataset'):
             for row in result['dataset']:
-                symbol, first, last, count, days = row
+                symbol, first, last, count, days, avg_spread = row
                 summary[symbol] = {
                     'first_data': datetime.fromisoformat(first.replace('Z', '+00:00')),
                     'last_data': datetime.fromisoformat(last.replace('Z', '+00:00')),
                     'record_count': count,
                     'days_covered': days,
+                    'avg_spread': avg_spread or 0.0,
                     'has_data': True
                 }
         
@@ -200,13 +218,7 @@ class HistoricalBackfillManager:
             
             if info['has_data']:
                 gap_hours = (now - info['last_data']).total_seconds() / 3600
-                
-                # Get average spread
-                spread_query = f"SELECT avg(spread) FROM market_data WHERE symbol = '{symbol}'"
-                spread_result = self.execute_query(spread_query)
-                avg_spread = 0.0
-                if spread_result and spread_result.get('dataset') and spread_result['dataset'][0][0]:
-                    avg_spread = spread_result['dataset'][0][0]
+                avg_spread = info['avg_spread']
                 
                 print(f"{symbol:<10} {info['record_count']:<12,} {info['days_covered']:<6} "
                       f"{info['first_data'].strftime('%Y-%m-%d %H:%M'):<20} "
@@ -234,7 +246,7 @@ class HistoricalBackfillManager:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            response = self.session.get(url, headers=self.headers, params=params, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -481,11 +493,12 @@ class HistoricalBackfillManager:
         print("\n🔍 Scanning for duplicates...")
         
         # QuestDB doesn't support HAVING, so we need a different approach
-        # First, get the count summary for all symbols
+        # First, get total and unique-timestamp counts for all symbols in one pass
         query = """
         SELECT 
             symbol,
-            count(*) as total_records
+            count(*) as total_records,
+            count(DISTINCT timestamp) as unique_count
         FROM market_data
         GROUP BY symbol
         """
@@ -499,49 +512,35 @@ class HistoricalBackfillManager:
         duplicates = {}
         
         # For each symbol, check for duplicates
-        for row in result['dataset']:
-            symbol = row[0]
-            total_count = row[1]
-            
-            # Count unique timestamps for this symbol
-            unique_query = f"""
-            SELECT count(DISTINCT timestamp) as unique_count
-            FROM market_data
-            WHERE symbol = '{symbol}'
-            """
+        for symbol, total_count, unique_count in result['dataset']:
+            duplicate_count = total_count - unique_count
             
-            unique_result = self.execute_query(unique_query)
-            
-            if unique_result and unique_result.get('dataset'):
-                unique_count = unique_result['dataset'][0][0]
-                duplicate_count = total_count - unique_count
+            if duplicate_count > 0:
+                duplicates[symbol] = {
+                    'total': total_count,
+                    'unique': unique_count,
+                    'duplicates': duplicate_count
+                }
                 
-                if duplicate_count > 0:
-                    duplicates[symbol] = {
-                        'total': total_count,
-                        'unique': unique_count,
-                        'duplicates': duplicate_count
-                    }
-                    
-                    # Show some example duplicates
-                    example_query = f"""
-                    SELECT timestamp, count(*) as copies
-                    FROM market_data
-                    WHERE symbol = '{symbol}'
-                    GROUP BY timestamp
-                    ORDER BY count(*) DESC
-                    LIMIT 5
-                    """
-                    
-                    example_result = self.execute_query(example_query)
-                    if example_result and example_result.get('dataset'):
-                        examples = []
-                        for ex_row in example_result['dataset']:
-                            if ex_row[1] > 1:  # Only show actual duplicates
-                                examples.append(f"{ex_row[0]} ({ex_row[1]} copies)")
-                        if examples:
-                            duplicates[symbol]['examples'] = examples
-        
+                # Show some example duplicates
+                example_query = f"""
+                SELECT timestamp, count(*) as copies
+                FROM market_data
+                WHERE symbol = '{symbol}'
+                GROUP BY timestamp
+                ORDER BY count(*) DESC
+                LIMIT 5
+                """
+                
+                example_result = self.execute_query(example_query)
+                if example_result and example_result.get('dataset'):
+                    examples = []
+                    for ex_row in example_result['dataset']:
+                        if ex_row[1] > 1:  # Only show actual duplicates
+                            examples.append(f"{ex_row[0]} ({ex_row[1]} copies)")
+                    if examples:
+                        duplicates[symbol]['examples'] = examples
+    
         return duplicates
     
     def remove_duplicates_smart(self) -> bool:
@@ -815,25 +814,28 @@ class HistoricalBackfillManager:
         
         checks = []
         
-        # Check 1: Overall data statistics
+        # Check 1: Overall data statistics, plus check 2's recent record
+        # counts, from one scan of market_data
         print("   Checking data statistics...", end='', flush=True)
         stats_query = """
         SELECT 
             symbol,
             count(*) as record_count,
             min(timestamp) as first_record,
-            max(timestamp) as last_record
+            max(timestamp) as last_record,
+            sum(CASE WHEN timestamp > dateadd('h', -24, now()) THEN 1 ELSE 0 END) as recent_records
         FROM market_data
         GROUP BY symbol
         ORDER BY symbol
         """
         
         result = self.execute_query(stats_query)
-        if result and result.get('dataset'):
+        rows = result.get('dataset') if result else None
+        if rows:
             print(" ✅")
             print("\n   📊 Data Summary:")
-            for row in result['dataset']:
-                symbol, count, first, last = row
+            for row in rows:
+                symbol, count, first, last, _ = row
                 print(f"      {symbol}: {count:,} records ({first} to {last})")
         else:
             print(" ❌")
@@ -841,23 +843,13 @@ class HistoricalBackfillManager:
         
         # Check 2: Recent data availability
         print("\n   Checking recent data...", end='', flush=True)
-        recent_query = """
-        SELECT 
-            symbol,
-            count(*) as recent_records
-        FROM market_data
-        WHERE timestamp > dateadd('h', -24, now())
-        GROUP BY symbol
-        ORDER BY symbol
-        """
-        
-        result = self.execute_query(recent_query)
-        if result and result.get('dataset'):
+        recent = [(row[0], row[4]) for row in rows or [] if row[4]]
+        if recent:
             print(" ✅")
             missing_recent = []
-            for row in result['dataset']:
-                if row[1] < 100:  # Less than 100 records in 24h might indicate issues
-                    missing_recent.append(f"{row[0]} has only {row[1]} records in last 24h")
+            for symbol, recent_records in recent:
+                if recent_records < 100:  # Less than 100 records in 24h might indicate issues
+                    missing_recent.append(f"{symbol} has only {recent_records} records in last 24h")
             if missing_recent:
                 checks.extend(missing_recent)
         else: